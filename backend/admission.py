@@ -0,0 +1,138 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, bursts up to `capacity`
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def seconds_until_token(self) -> float:
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def reserve(self) -> float:
+        """
+        Take a token now, going into debt if there is none, and return how
+        many seconds until it is actually covered. Later callers see the
+        wait behind every reservation made before them.
+        """
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def refund(self):
+        """
+        Give back a reserved token that won't be used
+        """
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Per-user and global token-bucket rate limits plus a bounded wait queue
+    in front of the LLM.
+
+    admit(user_id) reserves a user token and a global token up front (the
+    buckets go into debt) and sleeps until both are covered. Because tokens
+    are reserved before waiting, concurrent requests from one user each see
+    the wait behind the earlier ones, so a flood is turned away after about
+    max_wait * user_rate queued requests instead of filling the shared
+    queue. If either wait exceeds max_wait, or the wait queue already holds
+    max_queue requests, it raises AdmissionRejected with a Retry-After hint.
+    """
+
+    def __init__(self, user_rate: float, user_burst: float, global_rate: float,
+                 global_burst: float, max_queue: int = 500, max_wait: float = 5.0,
+                 max_tracked_users: int = 10000):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.user_buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.max_tracked_users = max_tracked_users
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.waiting = 0
+        self.stats = {"admitted": 0, "rejected_user": 0,
+                      "rejected_timeout": 0, "rejected_queue_full": 0}
+
+    def _user_bucket(self, user_id: str) -> TokenBucket:
+        bucket = self.user_buckets.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate, self.user_burst)
+            self.user_buckets[user_id] = bucket
+            # Idle users' buckets are full anyway; dropping the oldest is safe
+            while len(self.user_buckets) > self.max_tracked_users:
+                self.user_buckets.popitem(last=False)
+        else:
+            self.user_buckets.move_to_end(user_id)
+        return bucket
+
+    async def admit(self, user_id: str):
+        user_bucket = self._user_bucket(user_id)
+
+        user_wait = user_bucket.reserve()
+        if user_wait > self.max_wait:
+            user_bucket.refund()
+            self.stats["rejected_user"] += 1
+            raise AdmissionRejected("user rate limit", user_wait)
+
+        if self.waiting >= self.max_queue:
+            user_bucket.refund()
+            self.stats["rejected_queue_full"] += 1
+            raise AdmissionRejected("queue full", self.max_wait)
+
+        global_wait = self.global_bucket.reserve()
+        if global_wait > self.max_wait:
+            user_bucket.refund()
+            self.global_bucket.refund()
+            self.stats["rejected_timeout"] += 1
+            raise AdmissionRejected("server busy", global_wait)
+
+        wait = max(user_wait, global_wait)
+        if wait > 0:
+            self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # The client went away; its reservation shouldn't delay others
+                user_bucket.refund()
+                self.global_bucket.refund()
+                raise
+            finally:
+                self.waiting -= 1
+        self.stats["admitted"] += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        return {**self.stats, "queue_depth": self.waiting,
+                "max_queue": self.max_queue, "tracked_users": len(self.user_buckets)}
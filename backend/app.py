@@ -1,19 +1,84 @@
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+try:
+    import orjson  # noqa: F401 - enables ORJSONResponse
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Any, Optional, Tuple
+from contextlib import asynccontextmanager
+from collections import deque
+import asyncio
+import httpx
 import openai
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import json
+import math
 import re
 from supabase import create_client, Client
 import jwt
 import time
+import uuid
+from stream_parser import JSONArrayStreamParser
+from recurrence import expand_events_data
+from date_resolver import resolve_dates
+from fast_parser import fast_parse, mentioned_times
+from parse_cache import ParseCache, make_cache_key
+from single_flight import SingleFlight
+from segmenter import split_into_segments, merge_segment_events
+from event_store import create_event_store, month_range
+from llm_schema import EVENTS_RESPONSE_FORMAT, parse_structured_events
+from request_policy import RequestPolicy
+from jobs import JobQueue, QueueFull
+from admission import AdmissionController, AdmissionRejected
+from logging_setup import configure_logging
+from llm_replay import FixtureMissing, LLMReplay
+from auth import TokenVerifier
+from interval_index import (CalendarIndexes, IntervalIndex, event_interval,
+                            find_free_slot, from_minute, parse_time_of_day,
+                            to_minute)
+from metrics import COUNT_BUCKETS, Counter, Histogram, render_metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared OpenAI client (and its connection pool) once per worker
+    and load the auth signing keys
+    """
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            OPENAI_READ_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONCURRENCY,
+            max_keepalive_connections=OPENAI_MAX_CONCURRENCY),
+    )
+    app.state.openai_client = openai.AsyncOpenAI(
+        api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, http_client=http_client)
+    app.state.llm_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    await TOKEN_VERIFIER.start()
+    if TOKEN_VERIFIER.last_refresh_error:
+        log.warning("could not load auth signing keys",
+                    error=TOKEN_VERIFIER.last_refresh_error)
+    BRAIN_DUMP_JOBS.start()
+    try:
+        yield
+    finally:
+        await BRAIN_DUMP_JOBS.stop()
+        await TOKEN_VERIFIER.stop()
+        await app.state.openai_client.close()
+        if LOG_LISTENER is not None:
+            LOG_LISTENER.stop()
 
-app = FastAPI(title="Calendar AI Backend", version="1.0.0")
+
+app = FastAPI(title="Calendar AI Backend", version="1.0.0",
+              lifespan=lifespan, default_response_class=DefaultResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,12 +86,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 security = HTTPBearer(auto_error=False)
 
 load_dotenv()
 
+# Structured JSON logs; payloads (raw GPT output, input text) are DEBUG and
+# only kept for LOG_PAYLOAD_SAMPLE_RATE of requests
+log, LOG_LISTENER = configure_logging(
+    "calendar_ai",
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    payload_sample_rate=float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0")),
+)
+
+BRAIN_DUMP_SECONDS = Histogram(
+    "brain_dump_seconds", "Total time to parse a brain dump")
+LLM_SECONDS = Histogram(
+    "llm_request_seconds", "Time spent waiting on one OpenAI completion")
+PARSE_SECONDS = Histogram(
+    "llm_output_parse_seconds", "Time to parse/validate one completion's JSON")
+EVENTS_PER_DUMP = Histogram(
+    "events_per_dump", "Events returned per brain dump", buckets=COUNT_BUCKETS)
+JSON_PARSE_FALLBACKS = Counter(
+    "json_parse_fallbacks_total", "Completions whose JSON failed to parse")
+PAST_DATE_CORRECTIONS = Counter(
+    "past_date_corrections_total", "Events moved off a past date to tomorrow")
+EMPTY_ARRAY_FALLBACKS = Counter(
+    "empty_array_fallbacks_total", "Completions that returned no events")
+LLM_ERROR_FALLBACKS = Counter(
+    "llm_error_fallbacks_total", "Parses that failed with an upstream error")
+REJECTED_REQUESTS = Counter(
+    "admission_rejections_total", "Requests answered with 429")
+PROMPT_TOKENS = Counter("prompt_tokens_total", "Prompt tokens sent")
+CACHED_PROMPT_TOKENS = Counter(
+    "cached_prompt_tokens_total", "Prompt tokens served from provider cache")
+COMPLETION_TOKENS = Counter("completion_tokens_total", "Completion tokens received")
+
 SUPABASE_URL = os.getenv("VITE_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("VITE_SUPABASE_ANON_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -38,18 +135,126 @@ if not SUPABASE_KEY:
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY environment variable is required")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-openai.api_key = OPENAI_API_KEY
+# Access-token verification: HS256 tokens against SUPABASE_JWT_SECRET,
+# asymmetric ones against the project's JWKS (loaded at startup, refreshed in
+# the background). AUTH_ALLOW_ANONYMOUS=1 lets requests without a token act
+# as the user_id they send, for local testing and benchmarks only.
+TOKEN_VERIFIER = TokenVerifier(
+    jwt_secret=os.getenv("SUPABASE_JWT_SECRET"),
+    jwks_url=os.getenv("AUTH_JWKS_URL",
+                       f"{SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"),
+    jwks_headers={"apikey": SUPABASE_KEY},
+    audience=os.getenv("AUTH_AUDIENCE", "authenticated"),
+    refresh_interval=float(os.getenv("AUTH_KEYS_REFRESH", "3600")),
+    cache_size=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000")),
+)
+AUTH_ALLOW_ANONYMOUS = os.getenv("AUTH_ALLOW_ANONYMOUS", "0") == "1"
+
+# Connection pool / concurrency settings for the shared async OpenAI client
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_READ_TIMEOUT = float(os.getenv("OPENAI_READ_TIMEOUT", "60"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "256"))
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Point at a stand-in server (e.g. bench/mock_openai.py); None uses OpenAI
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+# Ask for JSON-schema-constrained output instead of scraping a JSON array
+STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "1") == "1"
+
+# Rule-based parses at or above this confidence skip the LLM entirely
+FAST_PATH_CONFIDENCE = float(os.getenv("FAST_PATH_CONFIDENCE", "0.8"))
+
+# Long brain dumps are split into task clauses that are parsed concurrently
+SEGMENT_MIN_CHARS = int(os.getenv("SEGMENT_MIN_CHARS", "160"))
+SEGMENT_MAX_COUNT = int(os.getenv("SEGMENT_MAX_COUNT", "12"))
+SEGMENT_CONCURRENCY = int(os.getenv("SEGMENT_CONCURRENCY", "4"))
+
+# Request policy around GPT calls: per-attempt deadline, a hedged duplicate
+# request after LLM_HEDGE_DELAY seconds (set it near the observed p95; 0
+# disables), and an optional cascade model for output that fails validation
+LLM_POLICY = RequestPolicy(
+    attempt_timeout=float(os.getenv("LLM_ATTEMPT_TIMEOUT", "20")),
+    hedge_delay=float(os.getenv("LLM_HEDGE_DELAY", "8")),
+    cascade_model=os.getenv("LLM_CASCADE_MODEL"),
+)
+
+# Admission control for LLM-backed endpoints: token buckets per user and for
+# the whole process, plus a bounded queue of requests waiting for a token
+ADMISSION = AdmissionController(
+    user_rate=float(os.getenv("USER_RATE_PER_SEC", "0.5")),
+    user_burst=float(os.getenv("USER_BURST", "5")),
+    global_rate=float(os.getenv("GLOBAL_RATE_PER_SEC", "50")),
+    global_burst=float(os.getenv("GLOBAL_BURST", "100")),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "500")),
+    max_wait=float(os.getenv("ADMISSION_MAX_WAIT", "5")),
+)
+
+# Brain-dump job queue: a bounded worker pool drains per-user queues round-robin
+BRAIN_DUMP_JOBS = JobQueue(
+    lambda user_id, brain_dump: run_brain_dump(user_id, brain_dump),
+    workers=int(os.getenv("JOB_WORKERS", "32")),
+    max_pending=int(os.getenv("JOB_MAX_PENDING", "10000")),
+    result_ttl=float(os.getenv("JOB_RESULT_TTL", "3600")),
+)
+JOB_MAX_WAIT = 60.0
+
+# Record/replay of GPT completions for the offline regression suite
+# (bench/golden_suite.py): "off", "record" or "replay"
+LLM_REPLAY = LLMReplay(
+    mode=os.getenv("LLM_REPLAY_MODE", "off"),
+    fixture_dir=os.getenv("LLM_REPLAY_DIR", "bench/fixtures"),
+)
+
+# Parse result cache; set PARSE_CACHE_DB to share it between workers via SQLite
+PARSE_CACHE = ParseCache(
+    max_entries=int(os.getenv("PARSE_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("PARSE_CACHE_TTL", "3600")),
+    sqlite_path=os.getenv("PARSE_CACHE_DB"),
+    purge_interval=float(os.getenv("PARSE_CACHE_PURGE_INTERVAL", "300")),
+)
+
+# Event persistence: "supabase" in production, "sqlite" for tests/offline runs.
+# The events table has row level security (migrations/001_events.sql), so
+# the backend writes with the service-role key and checks ownership itself.
+EVENT_STORE_BACKEND = os.getenv("EVENT_STORE", "supabase")
+SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+supabase: Optional[Client] = None
+if EVENT_STORE_BACKEND == "supabase":
+    if not SUPABASE_SERVICE_ROLE_KEY:
+        raise ValueError("SUPABASE_SERVICE_ROLE_KEY environment variable is required")
+    supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+
+EVENT_STORE = create_event_store(
+    EVENT_STORE_BACKEND,
+    supabase_client=supabase,
+    sqlite_path=os.getenv("EVENT_STORE_DB", "events.db"),
+    # Keep at or below the Supabase project's max-rows setting
+    page_size=int(os.getenv("EVENT_STORE_PAGE_SIZE", "1000")),
+)
+
+# Per-user interval index over persisted timed events, used to place prep
+# events in free slots and flag conflicts. Stored events have no end time,
+# so each blocks EVENT_DEFAULT_MINUTES; prep work needs PREP_EVENT_MINUTES
+# inside WORKDAY_START..WORKDAY_END.
+EVENT_DEFAULT_MINUTES = int(os.getenv("EVENT_DEFAULT_MINUTES", "60"))
+PREP_EVENT_MINUTES = int(os.getenv("PREP_EVENT_MINUTES", "60"))
+WORKDAY_START = parse_time_of_day(os.getenv("WORKDAY_START", "09:00"))
+WORKDAY_END = parse_time_of_day(os.getenv("WORKDAY_END", "21:00"))
+CALENDAR_INDEXES = CalendarIndexes(
+    EVENT_STORE,
+    event_minutes=EVENT_DEFAULT_MINUTES,
+    max_users=int(os.getenv("CALENDAR_INDEX_USERS", "1000")),
+)
 
 
 class BrainDumpRequest(BaseModel):
     brain_dump: str
-    user_id: str
+    user_id: Optional[str] = None  # must match the token's user if sent
 
 
 class EventRequest(BaseModel):
     text: str
-    user_id: str
+    user_id: Optional[str] = None  # must match the token's user if sent
 
 
 class ProcessedEvent(BaseModel):
@@ -59,6 +264,7 @@ class ProcessedEvent(BaseModel):
     date: str  # YYYY-MM-DD format
     time: Optional[str] = None  # 12-hour format (e.g., "2:00 PM")
     priority: str
+    conflicts: Optional[List[str]] = None  # titles of overlapping events
 
 
 class EventResponse(BaseModel):
@@ -67,6 +273,7 @@ class EventResponse(BaseModel):
     message: str
 
 
+@lru_cache(maxsize=2048)
 def convert_to_12_hour(time_24):
     """Helper function to convert 24-hour time to 12-hour format"""
     if not time_24:
@@ -79,16 +286,43 @@ def convert_to_12_hour(time_24):
 
 
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Claims of the caller's verified access token; 401 if it is missing,
+    expired or badly signed. Repeat tokens are answered from the cache.
+    """
     if not credentials:
-        return {"sub": "anonymous"}  # Allow anonymous access for testing
+        if AUTH_ALLOW_ANONYMOUS:
+            return {"sub": "anonymous", "anonymous": True}
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
 
     try:
-        token = credentials.credentials
-        # Verify the JWT token with Supabase
-        payload = jwt.decode(token, options={"verify_signature": False})
-        return payload
-    except jwt.InvalidTokenError:
-        return {"sub": "anonymous"}  # Fallback to anonymous
+        return TOKEN_VERIFIER.verify(credentials.credentials)
+    except jwt.PyJWTError as e:
+        log.info("rejected access token", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+def authorized_user_id(current_user: dict, requested_user_id: Optional[str]) -> str:
+    """
+    The user a request acts as: the token's subject. A user_id in the request
+    must match it; anonymous (testing) callers act as the user_id they send.
+    """
+    if current_user.get("anonymous"):
+        return requested_user_id or current_user["sub"]
+    if requested_user_id and requested_user_id != current_user["sub"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="user_id does not match the authenticated user"
+        )
+    return current_user["sub"]
 
 
 @app.get("/")
@@ -96,291 +330,795 @@ async def root():
     return {"message": "Calendar AI Backend is running!"}
 
 
+def new_batch_id() -> str:
+    """
+    Short random tag that keeps event ids unique across concurrent responses
+    """
+    return uuid.uuid4().hex[:8]
+
+
+async def admit_llm_request(user_id: str):
+    """
+    Rate-limit LLM-backed endpoints per user and globally. Requests that can't
+    be admitted within ADMISSION_MAX_WAIT get a 429 instead of reaching OpenAI.
+    """
+    try:
+        await ADMISSION.admit(user_id)
+    except AdmissionRejected as e:
+        log.warning("request rejected", user_id=user_id, reason=e.reason)
+        REJECTED_REQUESTS.inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many requests ({e.reason}), please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+
+
+def to_frontend_event(event: ProcessedEvent, index: int, batch_id: str) -> Dict[str, Any]:
+    """
+    Convert a ProcessedEvent to the dict shape the Dashboard expects
+    """
+    return {
+        "id": f"ai_{int(datetime.now().timestamp())}_{batch_id}_{index}",
+        "title": event.title,
+        "description": event.description,
+        "date": event.date,
+        "time": event.time,
+        "priority": event.priority,
+        "conflicts": event.conflicts or []
+    }
+
+
+async def parse_and_persist(user_id: str, brain_dump: str) -> List[Dict[str, Any]]:
+    """
+    Parse a brain dump, save the events and return them in frontend format
+    """
+    processed_events = await parse_events_with_gpt(brain_dump, user_id=user_id)
+
+    # Convert to the format expected by the frontend
+    batch_id = new_batch_id()
+    frontend_events = [
+        to_frontend_event(event, i, batch_id)
+        for i, event in enumerate(processed_events)
+    ]
+
+    await persist_events(user_id, frontend_events)
+    return frontend_events
+
+
+async def run_brain_dump(user_id: str, brain_dump: str) -> List[Dict[str, Any]]:
+    """
+    Parse a brain dump, save the events and return them in frontend format.
+    Shared by the synchronous endpoints and the job workers.
+    """
+    start_time = time.perf_counter()
+    # Identical requests already in flight (double clicks, retries) share one
+    # parse and one save, and get back the same stored events
+    flight_key = (user_id, make_cache_key(brain_dump, datetime.now()))
+    frontend_events = await BRAIN_DUMP_FLIGHTS.do(
+        flight_key, lambda: parse_and_persist(user_id, brain_dump))
+    BRAIN_DUMP_SECONDS.observe(time.perf_counter() - start_time)
+    EVENTS_PER_DUMP.observe(len(frontend_events))
+
+    log.info("brain dump processed", user_id=user_id, events=len(frontend_events),
+             seconds=round(time.perf_counter() - start_time, 3))
+    return frontend_events
+
+
 @app.post("/api/process-brain-dump")
-async def process_brain_dump(request: BrainDumpRequest):
+async def process_brain_dump(
+    request: BrainDumpRequest,
+    current_user: dict = Depends(verify_token)
+):
     """
     Process brain dump text and return structured events for the calendar
     """
+    user_id = authorized_user_id(current_user, request.user_id)
+    await admit_llm_request(user_id)
     try:
-        print(f"Received brain dump request: {request.brain_dump[:50]}...")
-        print("Starting time...")
-        start_time = time.perf_counter()
-        # Process the brain dump text with GPT
-        processed_events = await parse_events_with_gpt(request.brain_dump)
-        end_time = time.perf_counter()
-        elapsed = end_time - start_time
-        print(f"Brain dump process TIME in {elapsed:.2f} seconds")
-        print(f"GPT processed {len(processed_events)} events")
-
-        # Convert to the format expected by the frontend
-        frontend_events = []
-        for i, event in enumerate(processed_events):
-            frontend_events.append({
-                "id": f"ai_{int(datetime.now().timestamp())}_{i}",
-                "title": event.title,
-                "description": event.description,
-                "date": event.date,
-                "time": event.time,
-                "priority": event.priority
-            })
-
-        print(f"Returning {len(frontend_events)} events to frontend")
-        return frontend_events
+        log.payload("brain dump received", text=request.brain_dump)
+        return await run_brain_dump(user_id, request.brain_dump)
 
     except Exception as e:
-        print(f"Error processing brain dump: {str(e)}")
+        log.error("error processing brain dump", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing brain dump: {str(e)}"
         )
 
 
-async def parse_events_with_gpt(text: str) -> List[ProcessedEvent]:
+@app.post("/api/process-brain-dump/stream")
+async def process_brain_dump_stream(
+    request: BrainDumpRequest,
+    current_user: dict = Depends(verify_token)
+):
     """
-    Use GPT to parse the brain dump text and extract structured events
+    Streaming variant of /api/process-brain-dump. Responds with NDJSON, one
+    frontend event per line, written as soon as GPT closes that event's object.
+    Calendar placement needs the whole batch, so once the parse ends every
+    event that placement moved or flagged is sent again as {"update": event}
+    with the same id; the saved events are the placed ones. A final
+    {"done": true, "count": n} line (or {"error": ...}) ends the stream.
     """
-    try:
-        print(f"Sending to GPT: {text[:100]}...")
+    user_id = authorized_user_id(current_user, request.user_id)
+    await admit_llm_request(user_id)
+    log.payload("streaming brain dump received", text=request.brain_dump)
+    text = request.brain_dump
 
-        # Get current date info
+    async def event_lines():
+        start_time = time.perf_counter()
         current_date = datetime.now()
-        current_day = current_date.strftime('%A')
-        today = current_date.strftime('%Y-%m-%d')
-        current_weekday = current_date.weekday()  # Monday=0, Sunday=6
-        
-        print(
-            f"🔍 DEBUG - Today is: {current_date.strftime('%Y-%m-%d %A')} (weekday: {current_weekday})")
-
-        # Create a more precise date calculation explanation for GPT
-        prompt = f"""
-        You are a smart calendar assistant. Parse this text and create appropriate calendar events.
-
-        TODAY IS: {today} which is a {current_day} (weekday number: {current_weekday} where Monday=0, Sunday=6)
-        Current time: {current_date.strftime('%H:%M')}
-
-        Text to parse: "{text}"
-
-        STEP 1: Break down the input into individual tasks/events
-        STEP 2: For each task, determine if it needs preparation or not
-        STEP 3: Calculate dates using these PRECISE RULES:
-
-        WEEKDAY MAPPING: Monday=0, Tuesday=1, Wednesday=2, Thursday=3, Friday=4, Saturday=5, Sunday=6
-        Today is {current_day} which is weekday {current_weekday}
-
-        DATE CALCULATION RULES:
-
-        1. FOR DAYS WITHOUT "NEXT" (like "friday", "monday"):
-           - Find the NEXT upcoming occurrence of that weekday
-           - If the target weekday is LATER this week: days_to_add = target_weekday - current_weekday
-           - If the target weekday is EARLIER this week OR same day: days_to_add = (7 - current_weekday) + target_weekday
-           
-           Examples if today is wednesday (weekday 2):
-           - "friday" → Friday is weekday 4 → 4 - 2 = 2 days → {(current_date + timedelta(days=2)).strftime('%Y-%m-%d')}
-           - "monday" → Monday is weekday 0 → (7 - 2) + 0 = 5 days → {(current_date + timedelta(days=5)).strftime('%Y-%m-%d')}
-           - "wednesday" → Same day, so next week → 7 days → {(current_date + timedelta(days=7)).strftime('%Y-%m-%d')}
-
-            Examples if today is Monday (weekday 0):
-           - "Monday" → Same day, so next week → 7 days → {(current_date + timedelta(days=7)).strftime('%Y-%m-%d')}
-
-           Examples if today is Tuesday (weekday 1):
-           - "Tuesday" → Same day, so next week → 7 days → {(current_date + timedelta(days=7)).strftime('%Y-%m-%d')}
-
-           Examples if today is Thursday (weekday 3):
-           - "Thursday" → Same day, so next week → 7 days → {(current_date + timedelta(days=7)).strftime('%Y-%m-%d')}
-
-           Examples if today is Friday (weekday 4):
-           - "Friday" → Same day, so next week → 7 days → {(current_date + timedelta(days=7)).strftime('%Y-%m-%d')}
-
-           Examples if today is Saturday (weekday 5):
-           - "Saturday" → Same day, so next week → 7 days → {(current_date + timedelta(days=7)).strftime('%Y-%m-%d')}
-
-           Examples if today is Sunday (weekday 6):
-           - "Sunday" → Same day, so next week → 7 days → {(current_date + timedelta(days=7)).strftime('%Y-%m-%d')}
-
-        2. FOR DAYS WITH "NEXT" (like "next friday", "next monday"):
-           - ALWAYS go to the following week (at least 7 days)
-           - days_to_add = 7 + (target_weekday - current_weekday) if target_weekday >= current_weekday
-           - days_to_add = 7 + (7 - current_weekday) + target_weekday if target_weekday < current_weekday
-           
-           Examples if today is Wednesday (weekday 2):
-           - "next friday" → Friday is weekday 4 → 7 + (4 - 2) = 9 days → {(current_date + timedelta(days=9)).strftime('%Y-%m-%d')}
-           - "next monday" → Monday is weekday 0 → 7 + (7 - 2) + 0 = 12 days → {(current_date + timedelta(days=12)).strftime('%Y-%m-%d')}
-
-        3. FOR RELATIVE DAYS:
-           - "tomorrow" → +1 day → {(current_date + timedelta(days=1)).strftime('%Y-%m-%d')}
-           - "day after tomorrow" → +2 days → {(current_date + timedelta(days=2)).strftime('%Y-%m-%d')}
-
-        4. FOR DAYS WITH "UNTIL" (like "until next friday", "until October 20th")
-            - PREVIOUS RULES STILL APPLY. Calculate days as previously mentioned.
-            - if user says "until next friday" or any day of the week, create events up until AND including that day. if it was "until next saturday" it's EVERYDAY a new event UNTIL and INCLUDING NEXT saturday.
-            - if user says "until October 20th," or any specified DATE, create one event up until AND including that date. 
-            - if user says "until the end of this week" create events up until AND including the last day of the CURRENT week. treat it as if you are creating events up until AND including THIS sunday.
-            - if user says "until the end of October" or any other month, then create events up until AND including the LAST day of that month. you should know how long each month is.
-            - if user says "every monday until next friday" then ONLY create events on mondays UNTIL next friday. this logic applies if the user inputted a different day of the week instead.
-            - if user says "every monday and wednesday until October 20th" then ONLY create events on monday and wednesday UNTIL and INCLUDING October 20th. this logic applies if the user inputted a different date instead.
-
-        CRITICAL RULES FOR MULTIPLE ITEMS:
-
-        1. **WHEN INPUT SPECIFIES A NUMBER**: 
-           - "7 projects due friday" = Create 7 separate project events
-           - "3 assignments due monday" = Create 3 separate assignment events
-           - Each should have a unique title like "Project 1 Due", "Project 2 Due", etc.
-           - Each should have preparation events if they are work/academic deadlines
-
-        2. **ONLY create preparation events for WORK/ACADEMIC DEADLINES**
-           - Words that need preparation: "due by", "deadline", "submit by", "finish by", "assignment due", "project due", "report due"
-           - Create TWO events: preparation day before + deadline day
-           - Both get "high" priority
-
-        3. **NEVER create preparation events for these activities:**
-           - practice, rehearsal, training, workout, gym
-           - church, service, worship, meeting
-           - appointments, calls, social events
-           - shopping, errands, personal tasks
-           - These get ONE event only on the specified day
-
-        4. **Process ALL parts of the input - don't miss any tasks!**
-
-        5. **Do NOT miss out on MULTIPLE "until" tasks. If the user includes multiple different "until" tasks, separate them and create events following the "until" rules specified earlier.**
-
-        6. **If user does not specify end date for repeating events (AKA events that include "until" and "every") create events until the end of the NEXT month. so only include current month + next month.**
-
-        IMPORTANT: 
-        - Use the precise weekday calculation formulas above
-        - **NEVER put events on past dates**
-        - Process EVERY task mentioned in the input
-        - Don't duplicate events UNLESS specified with the "UNTIL" keyword.
-        - Only ONE preparation event per deadline
-        - Return events in chronological order
-        - NO preparation events for practice/gym/church/calls/meetings!
-        - When a user gives a specific date (like "September 12th"), place the event ON THAT DATE
-        - If no specific time is provided, leave time as null
-
-        CALCULATION VERIFICATION:
-        - Today: {current_day} (weekday {current_weekday})
-        - This Friday would be: {(current_date + timedelta(days=(4-current_weekday) if 4 > current_weekday else 7-(current_weekday-4))).strftime('%Y-%m-%d')}
-        - Next Friday would be: {(current_date + timedelta(days=7+(4-current_weekday) if 4 >= current_weekday else 7+(7-current_weekday)+4)).strftime('%Y-%m-%d')}
-
-        Return ONLY a valid JSON array with format:
-        [{{"title": "Event Title", "description": "Description", "date": "YYYY-MM-DD", "time": "HH:MM or null", "priority": "high/medium/low"}}]
-
-        TITLE EXAMPLES:
-        - For "project due friday": Title="Friday Project Due", Prep Title="Work on Friday Project"
-        - For "project due next thursday": Title="Next Thursday Project Due", Prep Title="Prepare Next Thursday Project"
-        - For "assignment due monday": Title="Monday Assignment Due", Prep Title="Work on Monday Assignment"
-
-        Make sure ALL tasks from the input are included, dates are calculated correctly, and titles are specific to each project/day!
-        """
-
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",  # Changed from gpt-4.1-nano which doesn't exist
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a calendar assistant that calculates dates precisely based on weekday numbers. Use the exact formulas provided to calculate dates. Always return valid JSON arrays. Process ALL tasks mentioned in the input."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,  # Lower temperature for more consistent date calculations
-            max_tokens=1500
-        )
+        batch_id = new_batch_id()
+        parsed_events = []
+        sent_events = []
+
+        def emit(event: ProcessedEvent) -> str:
+            frontend_event = to_frontend_event(
+                event, len(sent_events), batch_id)
+            parsed_events.append(event)
+            sent_events.append(frontend_event)
+            return json.dumps(frontend_event) + "\n"
+
+        try:
+            async for event in stream_parsed_events(text, current_date):
+                yield emit(event)
+
+            if not sent_events:
+                log.info("GPT streamed no events, creating smart fallback event")
+                EMPTY_ARRAY_FALLBACKS.inc()
+                for i, event_data in enumerate(build_fallback_events_data(text, current_date)):
+                    yield emit(build_processed_event(event_data, i, current_date))
+
+            scheduled = await schedule_against_calendar(
+                user_id, parsed_events, current_date, text)
+            for frontend_event, before, after in zip(sent_events, parsed_events, scheduled):
+                if after is before:
+                    continue
+                frontend_event.update(date=after.date, time=after.time,
+                                      conflicts=after.conflicts or [])
+                yield json.dumps({"update": frontend_event}) + "\n"
+
+            BRAIN_DUMP_SECONDS.observe(time.perf_counter() - start_time)
+            EVENTS_PER_DUMP.observe(len(sent_events))
+
+            await persist_events(user_id, sent_events)
+            yield json.dumps({"done": True, "count": len(sent_events)}) + "\n"
+
+        except Exception as e:
+            log.error("error streaming brain dump", error=str(e))
+            yield json.dumps({"error": f"Error processing brain dump: {str(e)}"}) + "\n"
+
+    return StreamingResponse(event_lines(), media_type="application/x-ndjson")
+
+
+async def stream_parsed_events(text: str, current_date: datetime):
+    """
+    Yield ProcessedEvents for text as soon as each one is available: from the
+    parse cache, the rule-based fast path, or a streamed GPT completion.
+    """
+    cache_key = make_cache_key(text, current_date)
+    cached_events = await PARSE_CACHE.get(cache_key)
+    if cached_events is not None:
+        for i, event_data in enumerate(cached_events):
+            yield ProcessedEvent(id=f"gpt_{i}", **event_data)
+        return
+
+    fast_events = fast_path_events_data(text, current_date)
+    if fast_events is not None:
+        for i, event_data in enumerate(fast_events):
+            yield build_processed_event(event_data, i, current_date)
+        return
+
+    parser = JSONArrayStreamParser()
+    streamed_events = []
+    outcome: Dict[str, Any] = {}
+    async for delta in stream_chat_completion(
+        outcome,
+        model=OPENAI_MODEL,
+        messages=build_parse_messages(text, current_date),
+        temperature=0.1,
+        max_tokens=1500,
+        **structured_output_args()
+    ):
+        for event_data in expand_events_data(parser.feed(delta), current_date):
+            try:
+                event = build_processed_event(
+                    event_data, len(streamed_events), current_date)
+            except (ValueError, TypeError) as e:
+                log.warning("skipping invalid streamed event", error=str(e))
+                continue
+            streamed_events.append(event)
+            yield event
+
+    # A truncated (finish_reason "length") or unterminated array is a partial
+    # parse; caching it would serve the missing events as gone
+    if streamed_events and parser.finished and outcome.get("finish_reason") == "stop":
+        await PARSE_CACHE.set(cache_key, [
+            event.model_dump(exclude={"id", "conflicts"}) for event in streamed_events
+        ])
+    else:
+        log.info("streamed parse not cached", events=len(streamed_events),
+                 array_closed=parser.finished, finish_reason=outcome.get("finish_reason"))
+
+
+async def persist_events(user_id: str, events: List[Dict[str, Any]]):
+    """
+    Save generated events so the Dashboard can reload them. A storage failure
+    is logged but doesn't fail the request; the user still gets their events.
+    """
+    if not events:
+        return
+    try:
+        await asyncio.to_thread(EVENT_STORE.add_events, user_id, events)
+    except Exception as e:
+        log.error("error saving events", user_id=user_id, error=str(e))
+
+
+# Token usage totals plus the most recent per-request records
+TOKEN_USAGE = {"requests": 0, "prompt_tokens": 0,
+               "cached_tokens": 0, "completion_tokens": 0}
+RECENT_TOKEN_USAGE = deque(maxlen=200)
+
+
+def record_token_usage(model: str, usage):
+    """
+    Record prompt/cached/completion tokens from a completion's usage block
+    """
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+    record = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "model": model,
+        "prompt_tokens": usage.prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "completion_tokens": usage.completion_tokens,
+    }
+    RECENT_TOKEN_USAGE.append(record)
+    TOKEN_USAGE["requests"] += 1
+    TOKEN_USAGE["prompt_tokens"] += usage.prompt_tokens
+    TOKEN_USAGE["cached_tokens"] += cached_tokens
+    TOKEN_USAGE["completion_tokens"] += usage.completion_tokens
+    PROMPT_TOKENS.inc(usage.prompt_tokens)
+    CACHED_PROMPT_TOKENS.inc(cached_tokens)
+    COMPLETION_TOKENS.inc(usage.completion_tokens)
+    log.debug("token usage", **record)
+
+
+async def create_chat_completion(**kwargs):
+    """
+    Send a chat completion through the shared async client without blocking
+    the event loop. The semaphore caps how many calls this worker has upstream.
+    """
+    async def send():
+        async with app.state.llm_semaphore:
+            with LLM_SECONDS.time():
+                return await app.state.openai_client.chat.completions.create(**kwargs)
+
+    response = await LLM_REPLAY.complete(kwargs, send)
+    record_token_usage(kwargs.get("model"), response.usage)
+    return response
 
-        # Parse the JSON response
-        gpt_response = response.choices[0].message.content.strip()
-        print(f"GPT raw response: {gpt_response}")
 
-        # Clean up the response
-        json_str = gpt_response.strip()
+async def stream_chat_completion(outcome: Optional[Dict[str, Any]] = None, **kwargs):
+    """
+    Stream a chat completion, yielding content deltas as they arrive. The
+    concurrency slot is held until the stream is fully consumed. The
+    choice's finish_reason is stored in outcome once the stream reports it.
+    """
+    if outcome is None:
+        outcome = {}
+    if LLM_REPLAY.enabled:
+        # Fixtures hold whole completions, so replay yields a single delta
+        response = await create_chat_completion(**kwargs)
+        if response.choices:
+            outcome["finish_reason"] = response.choices[0].finish_reason
+            if response.choices[0].message.content:
+                yield response.choices[0].message.content
+        return
+
+    async with app.state.llm_semaphore:
+        with LLM_SECONDS.time():
+            stream = await app.state.openai_client.chat.completions.create(
+                stream=True, stream_options={"include_usage": True}, **kwargs)
+            async for chunk in stream:
+                # The final chunk carries usage and no choices
+                if chunk.usage is not None:
+                    record_token_usage(kwargs.get("model"), chunk.usage)
+                if not chunk.choices:
+                    continue
+                if chunk.choices[0].finish_reason is not None:
+                    outcome["finish_reason"] = chunk.choices[0].finish_reason
+                if chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+
+# Static instructions, built once at import so every request shares a
+# byte-identical prefix that provider-side prompt caching can reuse. Anything
+# that changes per request (date, text) goes in the user message after it.
+PARSE_SYSTEM_PROMPT = (
+    "You are a smart calendar assistant. Dates in square brackets are already "
+    "resolved; use them exactly. Always return valid JSON. Process ALL tasks "
+    "mentioned in the input.\n"
+    """
+    Parse the text in the user message and create appropriate calendar events.
+    The user message gives TODAY's date and the text to parse.
+
+    STEP 1: Break down the input into individual tasks/events
+    STEP 2: For each task, determine if it needs preparation or not
+    STEP 3: Use the resolved dates:
+
+    DATE RULES:
+
+    1. Dates in square brackets after a phrase are ALREADY RESOLVED, e.g. "gym friday [2025-09-12]".
+       - Use the bracketed date EXACTLY for that phrase. Never recalculate it.
+       - For "until" phrases the bracketed date is the last day (inclusive).
+
+    2. For a date phrase WITHOUT brackets, pick the next upcoming matching date after today.
+
+    3. FOR REPEATING EVENTS ("until", "every", "daily"):
+        - DO NOT write out every occurrence. Return ONE event with a "recurrence" object and the server expands it.
+        - "date" is the FIRST occurrence.
+        - "recurrence" fields: "weekdays" (list of day names, omit for every day), "interval" (every N weeks with weekdays, every N days without), "until" (YYYY-MM-DD, inclusive), "count" (number of occurrences).
+        - "until next saturday [date]" or "until October 20th [date]" → every day, "until" = the bracketed date.
+        - "until the end of this week [date]" or "until the end of October [date]" → "until" = the bracketed date.
+        - "every monday until next friday [date]" → "weekdays": ["monday"], "until" = the bracketed date.
+        - "every monday and wednesday until October 20th" → "weekdays": ["monday", "wednesday"], "until" = that date.
+        - "every other tuesday" → "weekdays": ["tuesday"], "interval": 2.
+
+    CRITICAL RULES FOR MULTIPLE ITEMS:
+
+    1. **WHEN INPUT SPECIFIES A NUMBER**: 
+       - "7 projects due friday" = Create 7 separate project events
+       - "3 assignments due monday" = Create 3 separate assignment events
+       - Each should have a unique title like "Project 1 Due", "Project 2 Due", etc.
+       - Each should have preparation events if they are work/academic deadlines
+
+    2. **ONLY create preparation events for WORK/ACADEMIC DEADLINES**
+       - Words that need preparation: "due by", "deadline", "submit by", "finish by", "assignment due", "project due", "report due"
+       - Create TWO events: preparation day before + deadline day
+       - Both get "high" priority
+
+    3. **NEVER create preparation events for these activities:**
+       - practice, rehearsal, training, workout, gym
+       - church, service, worship, meeting
+       - appointments, calls, social events
+       - shopping, errands, personal tasks
+       - These get ONE event only on the specified day
+
+    4. **Process ALL parts of the input - don't miss any tasks!**
+
+    5. **Do NOT miss out on MULTIPLE "until" tasks. If the user includes multiple different "until" tasks, return one recurring event for each following the "until" rules specified earlier.**
+
+    6. **If user does not specify an end date for repeating events, leave "until" out. The server repeats them through the end of the NEXT month.**
+
+    IMPORTANT: 
+    - Use the bracketed dates exactly as given
+    - **NEVER put events on past dates**
+    - Process EVERY task mentioned in the input
+    - Don't duplicate events. Repeating events get ONE entry with a "recurrence" object.
+    - Only ONE preparation event per deadline
+    - Return events in chronological order
+    - NO preparation events for practice/gym/church/calls/meetings!
+    - When a user gives a specific date (like "September 12th"), place the event ON THAT DATE
+    - If no specific time is provided, leave time as null
+
+    Return ONLY a valid JSON array with format:
+    [{"title": "Event Title", "description": "Description", "date": "YYYY-MM-DD", "time": "HH:MM or null", "priority": "high/medium/low"}]
+    Repeating events add: "recurrence": {"weekdays": ["monday"], "interval": 1, "until": "YYYY-MM-DD or null", "count": null}
+
+    TITLE EXAMPLES:
+    - For "project due friday": Title="Friday Project Due", Prep Title="Work on Friday Project"
+    - For "project due next thursday": Title="Next Thursday Project Due", Prep Title="Prepare Next Thursday Project"
+    - For "assignment due monday": Title="Monday Assignment Due", Prep Title="Work on Monday Assignment"
+
+    Make sure ALL tasks from the input are included, dates are calculated correctly, and titles are specific to each project/day!
+    """
+)
+
+
+def build_parse_messages(text: str, current_date: datetime) -> List[Dict[str, str]]:
+    """
+    Build the chat messages that ask GPT to parse text relative to current_date:
+    the shared static system prompt plus a small per-request user message
+    """
+    # Resolve weekday/relative/month-day phrases locally so GPT doesn't do date math
+    annotated_text, _ = resolve_dates(text, current_date)
+
+    return [
+        {"role": "system", "content": PARSE_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": (
+                f"TODAY IS: {current_date.strftime('%Y-%m-%d')} which is a {current_date.strftime('%A')}\n"
+                f"Current time: {current_date.strftime('%H:%M')}\n\n"
+                f"Text to parse: \"{annotated_text}\""
+            )
+        }
+    ]
+
+
+DEADLINE_KEYWORDS = ['due by', 'deadline', 'submit by', 'finish by',
+                     'assignment due', 'project due', 'report due']
+
 
-        # Remove markdown code block formatting if present
-        if json_str.startswith('```json'):
-            json_str = json_str.replace(
-                '```json', '').replace('```', '').strip()
-        elif json_str.startswith('```'):
-            json_str = json_str.replace('```', '').strip()
+def build_fallback_events_data(text: str, current_date: datetime) -> List[Dict[str, Any]]:
+    """
+    Smart fallback used when GPT returns no events for the text
+    """
+    text_lower = text.lower()
+
+    # Only create preparation events for actual work deadlines
+    if any(word in text_lower for word in DEADLINE_KEYWORDS):
+        return [
+            {
+                "title": f"Work on: {text[:25]}",
+                "description": f"Preparation for: {text}",
+                "date": (current_date + timedelta(days=1)).strftime('%Y-%m-%d'),
+                "time": "14:00",
+                "priority": "high"
+            },
+            {
+                "title": f"Due: {text[:25]}",
+                "description": f"Deadline: {text}",
+                "date": (current_date + timedelta(days=2)).strftime('%Y-%m-%d'),
+                "time": "17:00",
+                "priority": "high"
+            }
+        ]
+    return [{
+        "title": text[:40] if len(text) <= 40 else text[:37] + "...",
+        "description": f"Event: {text}",
+        "date": (current_date + timedelta(days=1)).strftime('%Y-%m-%d'),
+        "time": "10:00",
+        "priority": "medium"
+    }]
+
+
+def build_processed_event(event_data: Dict[str, Any], index: int, current_date: datetime) -> ProcessedEvent:
+    """
+    Validate one event dict from GPT and convert it to a ProcessedEvent
+    """
+    # Validate date is not in the past
+    event_date = date.fromisoformat(event_data.get(
+        "date", current_date.strftime('%Y-%m-%d')))
+    if event_date < current_date.date():
+        log.debug("event date in the past, moving to tomorrow", date=str(event_date))
+        PAST_DATE_CORRECTIONS.inc()
+        event_data["date"] = (
+            current_date + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    # Convert 24-hour time to 12-hour format
+    time_24 = event_data.get("time")
+    time_12 = convert_to_12_hour(time_24)
+
+    return ProcessedEvent(
+        id=f"gpt_{int(current_date.timestamp())}_{index}",
+        title=event_data.get("title", "Untitled Event"),
+        description=event_data.get("description", ""),
+        date=event_data.get("date", current_date.strftime('%Y-%m-%d')),
+        time=time_12,
+        priority=event_data.get("priority", "medium")
+    )
+
+
+# In-flight brain dumps keyed by (user_id, normalized text + date)
+BRAIN_DUMP_FLIGHTS = SingleFlight()
 
-        # Try to find JSON array in the response
-        json_match = re.search(r'\[.*\]', json_str, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
+# How often each parsing tier answered (fast_path_escalated = rule-based parse
+# found events but was below FAST_PATH_CONFIDENCE, so the LLM was used)
+PARSE_TIER_COUNTS = {"fast_path": 0, "fast_path_escalated": 0, "llm": 0}
+
+
+def fast_path_events_data(text: str, current_date: datetime) -> Optional[List[Dict[str, Any]]]:
+    """
+    Try the rule-based parser first; None means the text needs the LLM
+    """
+    events_data, confidence = fast_parse(text, current_date)
+    if events_data and confidence >= FAST_PATH_CONFIDENCE:
+        PARSE_TIER_COUNTS["fast_path"] += 1
+        log.debug("fast path parsed brain dump",
+                  events=len(events_data), confidence=round(confidence, 2))
+        return events_data
+    if events_data:
+        PARSE_TIER_COUNTS["fast_path_escalated"] += 1
+    PARSE_TIER_COUNTS["llm"] += 1
+    return None
+
+
+async def parse_events_with_gpt(text: str, current_date: Optional[datetime] = None,
+                                user_id: Optional[str] = None) -> List[ProcessedEvent]:
+    """
+    Use GPT to parse the brain dump text and extract structured events.
+    Results are cached by normalized text and today's date; only ids are fresh.
+    current_date defaults to now; the regression suite pins it per case.
+    With user_id, prep events are moved into free slots of that user's
+    calendar and overlaps are flagged (after caching, which is user-agnostic).
+    """
+    current_date = current_date or datetime.now()
+    cache_key = make_cache_key(text, current_date)
+
+    cached_events = await PARSE_CACHE.get(cache_key)
+    if cached_events is not None:
+        log.debug("parse cache hit")
+        timestamp = int(datetime.now().timestamp())
+        processed_events = [
+            ProcessedEvent(id=f"gpt_{timestamp}_{i}", **event_data)
+            for i, event_data in enumerate(cached_events)
+        ]
+    else:
+        segments = split_into_segments(text, max_segments=SEGMENT_MAX_COUNT)
+        if len(text) >= SEGMENT_MIN_CHARS and len(segments) > 1:
+            processed_events, cacheable = await parse_segments(segments, current_date)
+        else:
+            processed_events, cacheable = await parse_events_uncached(text, current_date)
 
-        print(f"Final JSON to parse: {json_str}")
+        if cacheable:
+            await PARSE_CACHE.set(cache_key, [
+                event.model_dump(exclude={"id", "conflicts"}) for event in processed_events
+            ])
 
-        # Parse JSON
-        events_data = json.loads(json_str)
+    if user_id is not None:
+        processed_events = await schedule_against_calendar(
+            user_id, processed_events, current_date, text)
+    return processed_events
+
+
+PREP_TITLE_PATTERN = re.compile(r"^\s*(?:work on|prepare|prep)\b:?", re.IGNORECASE)
+DUE_TITLE_PATTERN = re.compile(r"\b(?:due|deadline)\b", re.IGNORECASE)
+SUBJECT_STOP_WORDS = {"work", "on", "prepare", "prep", "for", "the", "a", "an",
+                      "due", "deadline", "my", "to"}
+
+
+def title_subject(title: str) -> set:
+    """
+    Lowercased subject words of a title, without prep/deadline wording
+    """
+    return set(re.findall(r"[a-z0-9]+", title.lower())) - SUBJECT_STOP_WORDS
+
+
+def paired_due_event(prep: ProcessedEvent, events: List[ProcessedEvent]) -> Optional[ProcessedEvent]:
+    """
+    The deadline a generated prep event belongs to: the nearest due event in
+    the same batch, on or after the prep's date, about the same subject
+    ("Work on Friday Project" -> "Friday Project Due"). None means the title
+    only happens to start with "Work on"/"Prepare" and the user wrote it.
+    """
+    if not PREP_TITLE_PATTERN.match(prep.title):
+        return None
+    subject = title_subject(prep.title)
+    due_events = [
+        event for event in events
+        if event is not prep and DUE_TITLE_PATTERN.search(event.title)
+        and event.date >= prep.date and subject & title_subject(event.title)
+    ]
+    if not due_events:
+        return None
+    return min(due_events, key=lambda event: event.date)
+
+
+def due_deadline(due: ProcessedEvent) -> int:
+    """
+    Absolute minute prep work must be finished by: the due event's time, or
+    the start of the workday on its date
+    """
+    interval = event_interval(due.model_dump(), EVENT_DEFAULT_MINUTES)
+    if interval is not None:
+        return interval[0]
+    return to_minute(date.fromisoformat(due.date), WORKDAY_START)
+
+
+async def schedule_against_calendar(user_id: str, events: List[ProcessedEvent],
+                                    current_date: datetime, text: str = "") -> List[ProcessedEvent]:
+    """
+    Place generated prep events (paired with a due event in this batch) in
+    the first free PREP_EVENT_MINUTES slot before their deadline, trying
+    their suggested slot first, then from now. Events at a time the user
+    wrote in text are never moved. Every timed event that overlaps the
+    user's calendar or another event in this batch is flagged.
+    """
+    try:
+        calendar = await CALENDAR_INDEXES.get(user_id)
+    except Exception as e:
+        log.warning("calendar index unavailable, skipping placement", error=str(e))
+        return events
+
+    now = to_minute(current_date.date(), current_date.hour * 60 + current_date.minute)
+
+    # A paired prep keeps its time only if the user wrote that time and no
+    # other event in the batch accounts for the mention
+    scheduled = list(events)
+    paired = {i: paired_due_event(event, scheduled) for i, event in enumerate(scheduled)}
+    unclaimed_times: Dict[Optional[int], int] = {}
+    for value in mentioned_times(text):
+        minute_of_day = parse_time_of_day(value)
+        unclaimed_times[minute_of_day] = unclaimed_times.get(minute_of_day, 0) + 1
+    for i, event in enumerate(scheduled):
+        minute_of_day = parse_time_of_day(event.time)
+        if paired[i] is None and unclaimed_times.get(minute_of_day, 0) > 0:
+            unclaimed_times[minute_of_day] -= 1
+
+    # Batch-local ids: generated ids aren't final until to_frontend_event
+    batch = IntervalIndex()
+    movable_preps = []
+    for i, event in enumerate(scheduled):
+        due = paired[i]
+        if due is not None and unclaimed_times.get(parse_time_of_day(event.time), 0) <= 0:
+            movable_preps.append((i, due))
+            continue
+        interval = event_interval(event.model_dump(), EVENT_DEFAULT_MINUTES)
+        if interval is not None:
+            batch.add(f"batch_{i}", interval[0], interval[1], event.title)
+
+    for i, due in movable_preps:
+        prep = scheduled[i]
+        deadline = due_deadline(due)
+        interval = event_interval(prep.model_dump(), PREP_EVENT_MINUTES)
+        suggested = interval[0] if interval else to_minute(
+            date.fromisoformat(prep.date), WORKDAY_START)
+        slot = None
+        for not_before in (max(suggested, now), now):
+            slot = find_free_slot([calendar, batch], PREP_EVENT_MINUTES, not_before,
+                                  deadline, day_start=WORKDAY_START, day_end=WORKDAY_END)
+            if slot is not None:
+                break
+        if slot is not None:
+            slot_date, slot_time = from_minute(slot)
+            prep = prep.model_copy(update={
+                "date": slot_date, "time": convert_to_12_hour(slot_time)})
+            scheduled[i] = prep
+            interval = (slot, slot + PREP_EVENT_MINUTES)
+        if interval is not None:
+            batch.add(f"batch_{i}", interval[0], interval[1], prep.title)
+
+    for i, event in enumerate(scheduled):
+        interval = event_interval(event.model_dump(), EVENT_DEFAULT_MINUTES)
+        if interval is None:
+            continue
+        conflicts = [calendar.titles.get(event_id, "")
+                     for _, _, event_id in calendar.overlapping(*interval)]
+        conflicts += [batch.titles[event_id]
+                      for _, _, event_id in batch.overlapping(*interval)
+                      if event_id != f"batch_{i}"]
+        if conflicts:
+            scheduled[i] = event.model_copy(update={"conflicts": conflicts})
+
+    conflicted = sum(1 for event in scheduled if event.conflicts)
+    if conflicted:
+        log.debug("generated events overlap the calendar", user_id=user_id, events=conflicted)
+    return scheduled
+
+
+async def parse_segments(segments: List[str], current_date: datetime) -> Tuple[List[ProcessedEvent], bool]:
+    """
+    Parse independent task clauses concurrently (at most SEGMENT_CONCURRENCY
+    at a time) and merge them, so a long dump takes about as long as its
+    slowest clause instead of one huge completion.
+    """
+    log.debug("fanning out brain dump", segments=len(segments))
+    semaphore = asyncio.Semaphore(SEGMENT_CONCURRENCY)
+
+    async def parse_one(segment: str):
+        async with semaphore:
+            return await parse_events_uncached(segment, current_date)
+
+    results = await asyncio.gather(*(parse_one(segment) for segment in segments))
+    merged = merge_segment_events(events for events, _ in results)
+
+    timestamp = int(datetime.now().timestamp())
+    processed_events = [
+        event.model_copy(update={"id": f"gpt_{timestamp}_{i}"})
+        for i, event in enumerate(merged)
+    ]
+    return processed_events, all(cacheable for _, cacheable in results)
+
+
+def structured_output_args() -> Dict[str, Any]:
+    """
+    Extra completion arguments that request schema-constrained JSON output
+    """
+    if STRUCTURED_OUTPUT:
+        return {"response_format": EVENTS_RESPONSE_FORMAT}
+    return {}
+
+
+def parse_completion_events(response) -> List[Dict[str, Any]]:
+    """
+    Parse the event dicts out of a chat completion response
+    """
+    gpt_response = response.choices[0].message.content.strip()
+    log.payload("GPT raw response", response=gpt_response)
+
+    with PARSE_SECONDS.time():
+        if STRUCTURED_OUTPUT:
+            # Schema-constrained output: validate the whole array in one pass
+            return parse_structured_events(gpt_response)
+        return parse_freeform_events(gpt_response)
+
+
+def parse_freeform_events(gpt_response: str) -> List[Dict[str, Any]]:
+    """
+    Scrape a JSON array out of a free-form completion (STRUCTURED_OUTPUT off)
+    """
+    # Clean up the response
+    json_str = gpt_response.strip()
+
+    # Remove markdown code block formatting if present
+    if json_str.startswith('```json'):
+        json_str = json_str.replace(
+            '```json', '').replace('```', '').strip()
+    elif json_str.startswith('```'):
+        json_str = json_str.replace('```', '').strip()
+
+    # Try to find JSON array in the response
+    json_match = re.search(r'\[.*\]', json_str, re.DOTALL)
+    if json_match:
+        json_str = json_match.group()
+
+    # Parse JSON
+    return json.loads(json_str)
+
+
+async def parse_events_uncached(text: str, current_date: datetime) -> Tuple[List[ProcessedEvent], bool]:
+    """
+    Parse text relative to current_date. The flag is False for fallback
+    results, which must not be cached.
+    """
+    try:
+        log.payload("parsing brain dump", text=text,
+                    today=current_date.strftime('%Y-%m-%d %A'))
+
+        # Tier 1: simple one-liners are handled locally without a GPT call
+        fast_events = fast_path_events_data(text, current_date)
+        if fast_events is not None:
+            return [
+                build_processed_event(event_data, i, current_date)
+                for i, event_data in enumerate(fast_events)
+            ], True
+
+        messages = build_parse_messages(text, current_date)
+
+        def request_completion(model: str):
+            return create_chat_completion(
+                model=model,
+                messages=messages,
+                temperature=0.1,  # Lower temperature for more consistent date calculations
+                max_tokens=1500,
+                **structured_output_args()
+            )
+
+        # Deadline, hedging and cascade are handled by the request policy;
+        # a result only counts once its JSON parses
+        events_data = await LLM_POLICY.run(
+            OPENAI_MODEL, request_completion, parse_completion_events)
 
         # Enhanced fallback logic for empty arrays
         if not events_data:
-            print("GPT returned empty array, creating smart fallback event")
-            text_lower = text.lower()
-
-            # Only create preparation events for actual work deadlines
-            if any(word in text_lower for word in ['due by', 'deadline', 'submit by', 'finish by', 'assignment due', 'project due', 'report due']):
-                events_data = [
-                    {
-                        "title": f"Work on: {text[:25]}",
-                        "description": f"Preparation for: {text}",
-                        "date": (current_date + timedelta(days=1)).strftime('%Y-%m-%d'),
-                        "time": "14:00",
-                        "priority": "high"
-                    },
-                    {
-                        "title": f"Due: {text[:25]}",
-                        "description": f"Deadline: {text}",
-                        "date": (current_date + timedelta(days=2)).strftime('%Y-%m-%d'),
-                        "time": "17:00",
-                        "priority": "high"
-                    }
-                ]
-            else:
-                events_data = [{
-                    "title": text[:40] if len(text) <= 40 else text[:37] + "...",
-                    "description": f"Event: {text}",
-                    "date": (current_date + timedelta(days=1)).strftime('%Y-%m-%d'),
-                    "time": "10:00",
-                    "priority": "medium"
-                }]
-
-        # Convert to ProcessedEvent objects with validation
-        processed_events = []
-        for i, event_data in enumerate(events_data):
-            # Validate date is not in the past
-            event_date = datetime.strptime(event_data.get(
-                "date", current_date.strftime('%Y-%m-%d')), '%Y-%m-%d')
-            if event_date.date() < current_date.date():
-                print(
-                    f"Warning: Event date {event_date.date()} is in the past, moving to tomorrow")
-                event_data["date"] = (
-                    current_date + timedelta(days=1)).strftime('%Y-%m-%d')
-
-            # Convert 24-hour time to 12-hour format
-            time_24 = event_data.get("time")
-            time_12 = convert_to_12_hour(time_24)
-
-            processed_events.append(ProcessedEvent(
-                id=f"gpt_{int(datetime.now().timestamp())}_{i}",
-                title=event_data.get("title", "Untitled Event"),
-                description=event_data.get("description", ""),
-                date=event_data.get("date", current_date.strftime('%Y-%m-%d')),
-                time=time_12,
-                priority=event_data.get("priority", "medium")
-            ))
-
-        print(f"Successfully processed {len(processed_events)} events")
-        for event in processed_events:
-            print(f"  - {event.title} on {event.date} at {event.time}")
-
-        return processed_events
-
-    except json.JSONDecodeError as e:
-        print(f"JSON parsing error: {str(e)}")
-        print(f"GPT Response: {gpt_response}")
+            log.info("GPT returned empty array, creating smart fallback event")
+            EMPTY_ARRAY_FALLBACKS.inc()
+            events_data = build_fallback_events_data(text, current_date)
+
+        # Expand recurrence specs and convert to ProcessedEvent objects with validation
+        processed_events = [
+            build_processed_event(event_data, i, current_date)
+            for i, event_data in enumerate(expand_events_data(events_data, current_date))
+        ]
+
+        log.payload("parsed events", events=[
+            f"{event.title} on {event.date} at {event.time}" for event in processed_events
+        ])
+
+        return processed_events, True
+
+    except (json.JSONDecodeError, ValidationError) as e:
+        log.warning("JSON parsing error, using fallback events", error=str(e))
+        JSON_PARSE_FALLBACKS.inc()
 
         # Enhanced fallback with deadline detection
-        current_date = datetime.now()
         text_lower = text.lower()
 
-        if any(word in text_lower for word in ['due by', 'deadline', 'submit by', 'finish by', 'assignment due', 'project due', 'report due']):
+        if any(word in text_lower for word in DEADLINE_KEYWORDS):
             prep_event = ProcessedEvent(
                 id=f"fallback_prep_{int(datetime.now().timestamp())}",
                 title=f"Work on: {text[:25]}",
@@ -397,7 +1135,7 @@ async def parse_events_with_gpt(text: str) -> List[ProcessedEvent]:
                 time=convert_to_12_hour("17:00"),
                 priority="high"
             )
-            return [prep_event, due_event]
+            return [prep_event, due_event], False
         else:
             fallback_event = ProcessedEvent(
                 id=f"fallback_{int(datetime.now().timestamp())}",
@@ -407,11 +1145,14 @@ async def parse_events_with_gpt(text: str) -> List[ProcessedEvent]:
                 time=convert_to_12_hour("10:00"),
                 priority="medium"
             )
-            return [fallback_event]
+            return [fallback_event], False
 
+    except FixtureMissing:
+        # Replay runs must fail loudly, not score a fallback event
+        raise
     except Exception as e:
-        print(f"GPT processing error: {str(e)}")
-        current_date = datetime.now()
+        log.error("GPT processing error, using fallback event", error=str(e))
+        LLM_ERROR_FALLBACKS.inc()
         fallback_event = ProcessedEvent(
             id=f"error_fallback_{int(datetime.now().timestamp())}",
             title=f"Review: {text[:30]}...",
@@ -420,7 +1161,7 @@ async def parse_events_with_gpt(text: str) -> List[ProcessedEvent]:
             time=convert_to_12_hour("10:00"),
             priority="high"
         )
-        return [fallback_event]
+        return [fallback_event], False
 # Legacy endpoint for compatibility
 
 
@@ -432,7 +1173,7 @@ async def process_events(
     # Convert to new format and call the new endpoint
     brain_dump_request = BrainDumpRequest(
         brain_dump=request.text, user_id=request.user_id)
-    events = await process_brain_dump(brain_dump_request)
+    events = await process_brain_dump(brain_dump_request, current_user)
 
     return EventResponse(
         success=True,
@@ -441,14 +1182,149 @@ async def process_events(
     )
 
 
+def job_response(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Public view of a job: events only once it is done
+    """
+    response = {"job_id": job["job_id"], "status": job["status"]}
+    if job["status"] == "done":
+        response["events"] = job["result"]
+    elif job["status"] == "failed":
+        response["error"] = job["error"]
+    return response
+
+
+def get_job_or_404(job_id: str, current_user: dict) -> Dict[str, Any]:
+    """
+    The job, if it exists and belongs to the caller; other users' jobs are
+    reported as missing rather than forbidden
+    """
+    job = BRAIN_DUMP_JOBS.get(job_id)
+    if job is None or (not current_user.get("anonymous")
+                       and job["user_id"] != current_user["sub"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@app.post("/api/jobs/process-brain-dump", status_code=status.HTTP_202_ACCEPTED)
+async def submit_brain_dump_job(
+    request: BrainDumpRequest,
+    current_user: dict = Depends(verify_token)
+):
+    """
+    Queue a brain dump and return a job id right away. Poll
+    /api/jobs/{job_id}, long-poll /api/jobs/{job_id}/wait or subscribe to
+    /api/jobs/{job_id}/events (SSE) for the result.
+    """
+    user_id = authorized_user_id(current_user, request.user_id)
+    await admit_llm_request(user_id)
+    try:
+        job = BRAIN_DUMP_JOBS.submit(user_id, request.brain_dump)
+    except QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many queued brain dumps, try again shortly",
+            headers={"Retry-After": "5"}
+        )
+    return job_response(job)
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_brain_dump_job(job_id: str, current_user: dict = Depends(verify_token)):
+    return job_response(get_job_or_404(job_id, current_user))
+
+
+@app.get("/api/jobs/{job_id}/wait")
+async def wait_brain_dump_job(
+    job_id: str,
+    timeout: float = 25.0,
+    current_user: dict = Depends(verify_token)
+):
+    """
+    Long-poll: respond as soon as the job finishes, or after timeout seconds
+    with its current status
+    """
+    get_job_or_404(job_id, current_user)
+    job = await BRAIN_DUMP_JOBS.wait(job_id, min(max(timeout, 0.0), JOB_MAX_WAIT))
+    return job_response(job or get_job_or_404(job_id, current_user))
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_brain_dump_job(job_id: str, current_user: dict = Depends(verify_token)):
+    """
+    Server-Sent Events: a "status" event now, comment keep-alives while the
+    job runs, then one "result" event with the final job view
+    """
+    job = get_job_or_404(job_id, current_user)
+
+    async def sse_events():
+        yield f"event: status\ndata: {json.dumps(job_response(job))}\n\n"
+        while True:
+            current = await BRAIN_DUMP_JOBS.wait(job_id, 15.0)
+            if current is None or current["status"] in ("done", "failed"):
+                break
+            yield ": keep-alive\n\n"
+        if current is None:
+            final = {"job_id": job_id, "status": "expired"}
+        else:
+            final = job_response(current)
+        yield f"event: result\ndata: {json.dumps(final)}\n\n"
+
+    return StreamingResponse(sse_events(), media_type="text/event-stream")
+
+
 @app.get("/api/events")
-async def get_user_events(user_id: str, month: Optional[str] = None):
+async def get_user_events(
+    request: Request,
+    response: Response,
+    user_id: Optional[str] = None,
+    month: Optional[str] = None,
+    since: Optional[int] = None,
+    current_user: dict = Depends(verify_token)
+):
     """
     Get all events for a specific user (optional: filtered by month)
+
+    The ETag is built from the user's change sequence, so a matching
+    If-None-Match gets a 304 after a single sequence lookup. With
+    since=<cursor> only events changed after that cursor are returned, plus
+    the ids deleted since then. Every response includes the current cursor.
     """
+    user_id = authorized_user_id(current_user, user_id)
     try:
-        # For now, return empty array since we're not persisting to DB yet
-        return {"success": True, "events": []}
+        if month:
+            month_range(month)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="month must be in YYYY-MM format"
+        )
+
+    try:
+        # Read the cursor before the events: a change landing in between is
+        # sent again on the next delta instead of being missed
+        seq = await asyncio.to_thread(EVENT_STORE.current_seq, user_id)
+        view = "full" if since is None else f"since-{since}"
+        etag = f'W/"{user_id}:{month or "all"}:{view}:{seq}"'
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                            headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+
+        if since is not None:
+            events, deleted = await asyncio.to_thread(
+                EVENT_STORE.changes_since, user_id, since, month)
+            return {"success": True, "events": events, "deleted": deleted, "cursor": seq}
+
+        events = await asyncio.to_thread(EVENT_STORE.list_events, user_id, month)
+        return {"success": True, "events": events, "cursor": seq}
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -465,26 +1341,68 @@ async def delete_event(
     Delete a specific event
     """
     try:
-        # Placeholder for event deletion
-        return {"success": True, "message": "Event deleted successfully"}
+        # Scoped to the caller's own events (unscoped for anonymous testing)
+        owner = None if current_user.get("anonymous") else current_user["sub"]
+        deleted = await asyncio.to_thread(EVENT_STORE.delete_event, event_id, owner)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting event: {str(e)}"
         )
 
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    return {"success": True, "message": "Event deleted successfully"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus-format latency histograms and fallback counters
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/parser-stats")
+async def parser_stats():
+    """
+    Per-tier hit counts (used to tune FAST_PATH_CONFIDENCE), parse cache,
+    single-flight, request policy (used to tune LLM_HEDGE_DELAY), job queue,
+    admission control, LLM record/replay, auth, calendar index and token
+    usage stats
+    """
+    return {
+        "tiers": PARSE_TIER_COUNTS,
+        "cache": PARSE_CACHE.snapshot(),
+        "single_flight": BRAIN_DUMP_FLIGHTS.snapshot(),
+        "llm_policy": LLM_POLICY.snapshot(),
+        "jobs": BRAIN_DUMP_JOBS.snapshot(),
+        "admission": ADMISSION.snapshot(),
+        "llm_replay": LLM_REPLAY.snapshot(),
+        "auth": TOKEN_VERIFIER.snapshot(),
+        "calendar_index": CALENDAR_INDEXES.snapshot(),
+        "token_usage": {**TOKEN_USAGE, "recent": list(RECENT_TOKEN_USAGE)[-20:]},
+        "fast_path_confidence": FAST_PATH_CONFIDENCE
+    }
+
 
 @app.post("/api/debug-parse")
-async def debug_parse(request: BrainDumpRequest):
+async def debug_parse(
+    request: BrainDumpRequest,
+    current_user: dict = Depends(verify_token)
+):
     """
     Debug endpoint to see exactly what GPT is receiving and returning
     """
+    await admit_llm_request(authorized_user_id(current_user, request.user_id))
     try:
         current_date = datetime.now()
 
-        print(f"🔍 DEBUG - Input text: '{request.brain_dump}'")
-        print(
-            f"🔍 DEBUG - Current date: {current_date.strftime('%Y-%m-%d %A')}")
+        log.info("debug parse", today=current_date.strftime('%Y-%m-%d %A'))
+        log.payload("debug parse text", text=request.brain_dump)
 
         # Test the parsing without processing
         processed_events = await parse_events_with_gpt(request.brain_dump)
@@ -493,6 +1411,10 @@ async def debug_parse(request: BrainDumpRequest):
             "input_text": request.brain_dump,
             "current_date": current_date.strftime('%Y-%m-%d'),
             "current_day": current_date.strftime('%A'),
+            "resolved_dates": [
+                {"text": span, "date": iso}
+                for span, iso in resolve_dates(request.brain_dump, current_date)[1]
+            ],
             "processed_events": [
                 {
                     "id": event.id,
@@ -517,5 +1439,5 @@ async def debug_parse(request: BrainDumpRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    print("🚀 Starting server on http://localhost:5001")
+    log.info("starting server", url="http://localhost:5001")
     uvicorn.run(app, host="0.0.0.0", port=5001)
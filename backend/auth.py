@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import jwt
+
+# Only asymmetric algorithms are looked up in the JWKS, so a token can't pick
+# HS256 and get checked against a public key used as an HMAC secret
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "PS256", "PS384", "PS512",
+                         "ES256", "ES384", "ES512", "EdDSA"}
+
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens: signature, expiry and audience.
+
+    HS256 tokens are checked against jwt_secret; asymmetric ones against the
+    project's JWKS, which is loaded once in start() and refreshed in the
+    background every refresh_interval seconds (sooner when a token names an
+    unknown key id). Verified claims are kept in an LRU cache keyed by the
+    token's SHA-256 until the token expires, so repeat requests cost a hash
+    and a dict lookup instead of a signature check.
+    """
+
+    def __init__(self, jwt_secret: Optional[str] = None, jwks_url: Optional[str] = None,
+                 jwks_headers: Optional[Dict[str, str]] = None,
+                 audience: Optional[str] = "authenticated", refresh_interval: float = 3600,
+                 min_refresh_interval: float = 30, cache_size: int = 10000,
+                 leeway: float = 30):
+        self.jwt_secret = jwt_secret
+        self.jwks_url = jwks_url
+        self.jwks_headers = jwks_headers or {}
+        self.audience = audience
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.cache_size = cache_size
+        self.leeway = leeway
+        self.keys: Dict[str, jwt.PyJWK] = {}
+        self.cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.last_refresh = 0.0
+        self.last_refresh_error: Optional[str] = None
+        self.refresh_requested: Optional[asyncio.Event] = None
+        self.refresh_task: Optional[asyncio.Task] = None
+        self.stats = {"cache_hits": 0, "verified": 0, "rejected": 0,
+                      "key_refreshes": 0, "key_refresh_errors": 0}
+
+    async def start(self):
+        """
+        Load the signing keys, then keep them fresh in a background task;
+        call from inside the running event loop
+        """
+        self.refresh_requested = asyncio.Event()
+        if self.jwks_url:
+            await self.refresh_keys()
+            self.refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+            await asyncio.gather(self.refresh_task, return_exceptions=True)
+            self.refresh_task = None
+
+    async def refresh_keys(self):
+        self.last_refresh = time.monotonic()
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(self.jwks_url, headers=self.jwks_headers)
+                response.raise_for_status()
+            key_set = jwt.PyJWKSet.from_dict(response.json())
+        except Exception as e:
+            # Keep the keys we have; an outage shouldn't log everyone out
+            self.stats["key_refresh_errors"] += 1
+            self.last_refresh_error = str(e)
+            return
+        self.keys = {key.key_id: key for key in key_set.keys if key.key_id}
+        self.stats["key_refreshes"] += 1
+        self.last_refresh_error = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.refresh_requested.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.refresh_requested.clear()
+            # Rate-limited so tokens with made-up key ids can't hammer the JWKS
+            wait = self.last_refresh + self.min_refresh_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self.refresh_keys()
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Claims of a valid token; raises a jwt.PyJWTError otherwise
+        """
+        token_hash = hashlib.sha256(token.encode()).digest()
+        cached = self.cache.get(token_hash)
+        if cached is not None:
+            claims, expires_at = cached
+            if expires_at > time.time():
+                self.cache.move_to_end(token_hash)
+                self.stats["cache_hits"] += 1
+                return claims
+            del self.cache[token_hash]
+
+        try:
+            claims = self._decode(token)
+        except jwt.PyJWTError:
+            self.stats["rejected"] += 1
+            raise
+
+        self.stats["verified"] += 1
+        self.cache[token_hash] = (claims, float(claims["exp"]))
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return claims
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+
+        if algorithm == "HS256":
+            if not self.jwt_secret:
+                raise jwt.InvalidAlgorithmError("HS256 tokens are not accepted")
+            key: Any = self.jwt_secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            jwk = self.keys.get(header.get("kid"))
+            if jwk is None:
+                # Probably a rotated key: fetch the JWKS in the background
+                if self.refresh_requested is not None:
+                    self.refresh_requested.set()
+                raise jwt.InvalidTokenError("Unknown signing key")
+            key = jwk.key
+        else:
+            raise jwt.InvalidAlgorithmError(f"Unsupported algorithm: {algorithm}")
+
+        return jwt.decode(
+            token, key, algorithms=[algorithm], audience=self.audience,
+            leeway=self.leeway, options={"require": ["exp", "sub"]},
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "signing_keys": len(self.keys),
+                "cached_tokens": len(self.cache),
+                "last_refresh_error": self.last_refresh_error}
@@ -0,0 +1,291 @@
+"""
+Date-accuracy and token-cost regression suite over a golden corpus.
+
+Every case in bench/golden_corpus.json is parsed through the real pipeline
+(fast path, segmentation, prompt, request policy, recurrence expansion) with
+its reference date pinned. GPT calls go through the record/replay layer in
+llm_replay.py, so after one recording run the suite is offline and
+deterministic:
+
+    # once, and again after every prompt change (needs OPENAI_API_KEY)
+    python bench/golden_suite.py --mode record
+
+    # offline, in CI
+    python bench/golden_suite.py --mode replay
+
+    # accept the current numbers as the new baseline
+    python bench/golden_suite.py --mode replay --update-baseline
+
+Fixtures are keyed by a hash of the full request, so a prompt change misses
+every fixture until it is re-recorded; record, then compare against the
+baseline that was recorded with the old prompt.
+
+The report has date correctness per expected event, prompt/cached/completion
+tokens, parse-failure rate (cases that hit a fallback) and recorded LLM
+latency, and is diffed against bench/golden_baseline.json. The exit status is
+1 whenever a case hit a parse fallback or a request had no recorded fixture
+(with or without a baseline, and then no baseline is written), and on a
+regression against the baseline: lower date accuracy, a higher failure rate
+or more tokens than --token-tolerance allows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+
+# An unsigned JWT-shaped value; the backend only needs it to be present
+DUMMY_SUPABASE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.bench"
+
+MODES = {"record": "record", "replay": "replay", "live": "off"}
+
+
+def configure_environment(args):
+    """
+    Environment for importing app.py offline; must run before the import
+    """
+    os.environ["LLM_REPLAY_MODE"] = MODES[args.mode]
+    os.environ["LLM_REPLAY_DIR"] = args.fixtures
+    os.environ["EVENT_STORE"] = "sqlite"
+    os.environ.setdefault("EVENT_STORE_DB", os.path.join(BENCH_DIR, "events.db"))
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # A shared on-disk parse cache would answer without calling the model
+    os.environ["PARSE_CACHE_DB"] = ""
+    # Hedged duplicates would record twice and muddy token counts
+    os.environ.setdefault("LLM_HEDGE_DELAY", "0")
+    os.environ.setdefault("VITE_SUPABASE_URL", "http://127.0.0.1:9")
+    os.environ.setdefault("VITE_SUPABASE_ANON_KEY", DUMMY_SUPABASE_KEY)
+    if args.mode == "replay":
+        os.environ.setdefault("OPENAI_API_KEY", "replay")
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def score_case(case: Dict[str, Any], events) -> Dict[str, Any]:
+    """
+    Match parsed events to the expected ones by title keyword and count how
+    many expected occurrences landed on the right date
+    """
+    matched = set()
+    groups = []
+    for expected in case["expected"]:
+        keywords = [keyword.lower() for keyword in expected["match"]]
+        hits = [event for event in events
+                if any(keyword in event.title.lower() for keyword in keywords)]
+        matched.update(event.id for event in hits)
+        got = sorted(event.date for event in hits)
+        correct = sum((Counter(expected["dates"]) & Counter(got)).values())
+        group = {
+            "match": expected["match"],
+            "expected": expected["dates"],
+            "got": got,
+            "correct": correct,
+        }
+        if "time" in expected:
+            group["time_ok"] = bool(hits) and all(
+                event.time == expected["time"] for event in hits)
+        groups.append(group)
+
+    return {
+        "expected_events": sum(len(expected["dates"]) for expected in case["expected"]),
+        "correct_dates": sum(group["correct"] for group in groups),
+        "extra_events": sum(1 for event in events if event.id not in matched),
+        "groups": groups,
+    }
+
+
+async def run_suite(args) -> Dict[str, Any]:
+    configure_environment(args)
+    import app as backend
+
+    with open(args.corpus) as f:
+        cases = json.load(f)["cases"]
+    if args.case:
+        cases = [case for case in cases if case["id"] in args.case]
+
+    fallback_counters = [backend.JSON_PARSE_FALLBACKS, backend.LLM_ERROR_FALLBACKS,
+                         backend.EMPTY_ARRAY_FALLBACKS]
+    results = []
+    async with backend.lifespan(backend.app):
+        for case in cases:
+            reference_date = datetime.fromisoformat(case["reference_date"])
+            usage_before = dict(backend.TOKEN_USAGE)
+            fallbacks_before = sum(counter.value for counter in fallback_counters)
+            latency_before = backend.LLM_REPLAY.stats["recorded_latency_s"]
+            missing_before = backend.LLM_REPLAY.stats["missing"]
+
+            start = time.perf_counter()
+            try:
+                events = await backend.parse_events_with_gpt(
+                    case["text"], current_date=reference_date)
+            except backend.FixtureMissing:
+                # Counted in replay_missing below
+                events = []
+            elapsed = time.perf_counter() - start
+
+            result = {"id": case["id"], "category": case["category"], **score_case(case, events)}
+            result["failed"] = sum(counter.value for counter in fallback_counters) > fallbacks_before
+            result["replay_missing"] = backend.LLM_REPLAY.stats["missing"] - missing_before
+            for field in ("requests", "prompt_tokens", "cached_tokens", "completion_tokens"):
+                result[field] = backend.TOKEN_USAGE[field] - usage_before[field]
+            # Recorded latency in record/replay mode, wall time when live
+            if args.mode == "live":
+                result["llm_latency_s"] = round(elapsed, 3)
+            else:
+                result["llm_latency_s"] = round(
+                    backend.LLM_REPLAY.stats["recorded_latency_s"] - latency_before, 3)
+            results.append(result)
+
+    return {"summary": summarize(results), "cases": results}
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    expected = sum(result["expected_events"] for result in results)
+    correct = sum(result["correct_dates"] for result in results)
+    failures = sum(result["failed"] for result in results)
+    time_checks = [group["time_ok"] for result in results
+                   for group in result["groups"] if "time_ok" in group]
+    return {
+        "cases": len(results),
+        "expected_events": expected,
+        "correct_dates": correct,
+        "date_accuracy": round(correct / expected, 4) if expected else 1.0,
+        "times_correct": f"{sum(time_checks)}/{len(time_checks)}",
+        "extra_events": sum(result["extra_events"] for result in results),
+        "parse_failures": failures,
+        "parse_failure_rate": round(failures / len(results), 4) if results else 0.0,
+        "llm_calls": sum(result["requests"] for result in results),
+        "prompt_tokens": sum(result["prompt_tokens"] for result in results),
+        "cached_tokens": sum(result["cached_tokens"] for result in results),
+        "completion_tokens": sum(result["completion_tokens"] for result in results),
+        "llm_latency_s": round(sum(result["llm_latency_s"] for result in results), 3),
+        "replay_missing": sum(result["replay_missing"] for result in results),
+    }
+
+
+def diff_against_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                          token_tolerance: float) -> List[str]:
+    """
+    Print metric deltas and return the list of regressions
+    """
+    current, previous = report["summary"], baseline["summary"]
+    print("\nvs baseline:")
+    for field, value in current.items():
+        old = previous.get(field)
+        if isinstance(value, (int, float)) and isinstance(old, (int, float)) and value != old:
+            print(f"  {field:<20} {old} -> {value} ({value - old:+.4g})")
+
+    regressions = []
+    if current["date_accuracy"] < previous["date_accuracy"]:
+        regressions.append(
+            f"date accuracy {previous['date_accuracy']} -> {current['date_accuracy']}")
+    if current["parse_failure_rate"] > previous["parse_failure_rate"]:
+        regressions.append(
+            f"parse failure rate {previous['parse_failure_rate']} -> {current['parse_failure_rate']}")
+    for field in ("prompt_tokens", "completion_tokens"):
+        if previous[field] and current[field] > previous[field] * (1 + token_tolerance):
+            regressions.append(f"{field} {previous[field]} -> {current[field]}")
+
+    previous_cases = {case["id"]: case for case in baseline["cases"]}
+    for case in report["cases"]:
+        old = previous_cases.get(case["id"])
+        if old is None:
+            continue
+        if case["correct_dates"] < old["correct_dates"]:
+            regressions.append(
+                f"{case['id']}: {old['correct_dates']} -> {case['correct_dates']} correct dates")
+        if case["failed"] and not old["failed"]:
+            regressions.append(f"{case['id']}: now hits a parse fallback")
+    return regressions
+
+
+def check_failures(report: Dict[str, Any]) -> List[str]:
+    """
+    Problems that fail the run on their own, baseline or not
+    """
+    failures = []
+    summary = report["summary"]
+    if summary["replay_missing"]:
+        failures.append(f"{summary['replay_missing']} requests have no recorded fixture")
+    for case in report["cases"]:
+        if case["failed"]:
+            failures.append(f"{case['id']}: hit a parse fallback")
+    return failures
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'case':<24}{'dates':>9}{'extra':>7}{'fail':>6}{'prompt':>8}{'compl':>7}")
+    for case in report["cases"]:
+        dates = f"{case['correct_dates']}/{case['expected_events']}"
+        print(f"{case['id']:<24}{dates:>9}{case['extra_events']:>7}"
+              f"{'yes' if case['failed'] else '':>6}{case['prompt_tokens']:>8}"
+              f"{case['completion_tokens']:>7}")
+        for group in case["groups"]:
+            if group["correct"] < len(group["expected"]) or group.get("time_ok") is False:
+                print(f"    {'/'.join(group['match'])}: expected {group['expected']} got {group['got']}"
+                      + (" (time wrong)" if group.get("time_ok") is False else ""))
+    print("\nsummary:")
+    for field, value in report["summary"].items():
+        print(f"  {field:<20} {value}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=sorted(MODES), default="replay")
+    parser.add_argument("--corpus", default=os.path.join(BENCH_DIR, "golden_corpus.json"))
+    parser.add_argument("--fixtures", default=os.path.join(BENCH_DIR, "fixtures"))
+    parser.add_argument("--baseline", default=os.path.join(BENCH_DIR, "golden_baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--token-tolerance", type=float, default=0.05,
+                        help="allowed fractional token increase before it counts as a regression")
+    parser.add_argument("--case", action="append", help="only run this case id (repeatable)")
+    parser.add_argument("--json", dest="json_out", help="also write the report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run_suite(args))
+    print_report(report)
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = check_failures(report)
+    if failures:
+        print("\nFAILURES:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nno baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = diff_against_baseline(report, baseline, args.token_tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
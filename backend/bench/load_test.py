@@ -0,0 +1,274 @@
+"""
+Concurrent load driver for the backend, with a latency / event-loop-lag report.
+
+Fully offline when pointed at bench/mock_openai.py. --spawn starts both the
+mock and the backend (SQLite event store, dummy Supabase credentials,
+anonymous auth, loose admission limits) and tears them down afterwards:
+
+    python bench/load_test.py --spawn --concurrency 64 --duration 30
+
+Or against servers you started yourself:
+
+    python bench/load_test.py --target http://localhost:8000
+
+Traffic is a weighted mix of POST /api/process-brain-dump, POST
+/process-events and GET /api/events spread across --users user ids. Brain
+dumps carry a unique nonce so the parse cache and single-flight don't hide
+LLM-path latency (pass --allow-cache to measure warm-cache behavior instead).
+
+Event-loop lag is measured by a probe that calls GET / every --probe-interval
+seconds; that handler does no work, so its latency is time spent waiting for
+the server's event loop. A blocking call in a request path shows up here as
+a p99 in the hundreds of milliseconds.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BRAIN_DUMPS = [
+    "Dentist appointment Tuesday at 3pm, call mom tomorrow, and submit the tax forms by Friday",
+    "Team standup every Monday at 9am until the end of next month",
+    "Finish the research paper by the 28th, book flights next week, gym every Wednesday",
+    "Grocery shopping tomorrow morning and pick up dry cleaning on Thursday",
+    "Plan birthday party for Saturday at 6pm; send invites by Wednesday",
+    "Study for the chemistry exam on Friday, review chapters 3 to 5 over the next few days",
+    "Project kickoff next Monday at 10am, then weekly syncs every Thursday at 2pm",
+    "Renew passport before the end of the month and schedule the car service",
+]
+
+# An unsigned JWT-shaped value; the backend only needs it to be present
+DUMMY_SUPABASE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.bench"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Results:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.probe_latencies: List[float] = []
+
+    def record(self, endpoint: str, seconds: float, status: str):
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        total = 0
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            total += len(values)
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+                "statuses": dict(self.statuses[endpoint]),
+            }
+        probes = sorted(self.probe_latencies)
+        return {
+            "duration_s": round(elapsed, 2),
+            "total_requests": total,
+            "total_rps": round(total / elapsed, 2),
+            "endpoints": endpoints,
+            "event_loop_lag": {
+                "samples": len(probes),
+                "p50_ms": round(percentile(probes, 50) * 1000, 1),
+                "p95_ms": round(percentile(probes, 95) * 1000, 1),
+                "p99_ms": round(percentile(probes, 99) * 1000, 1),
+                "max_ms": round(probes[-1] * 1000, 1) if probes else 0.0,
+            },
+        }
+
+
+def brain_dump_text(allow_cache: bool) -> str:
+    text = random.choice(BRAIN_DUMPS)
+    if allow_cache:
+        return text
+    return f"{text}. Note {uuid.uuid4().hex[:8]}"
+
+
+async def one_request(client: httpx.AsyncClient, args, results: Results):
+    user_id = f"bench-user-{random.randrange(args.users)}"
+    roll = random.random() * (args.weight_brain_dump + args.weight_process_events
+                              + args.weight_events)
+    start = time.perf_counter()
+    try:
+        if roll < args.weight_brain_dump:
+            endpoint = "POST /api/process-brain-dump"
+            response = await client.post("/api/process-brain-dump", json={
+                "brain_dump": brain_dump_text(args.allow_cache), "user_id": user_id})
+        elif roll < args.weight_brain_dump + args.weight_process_events:
+            endpoint = "POST /process-events"
+            response = await client.post("/process-events", json={
+                "text": brain_dump_text(args.allow_cache), "user_id": user_id})
+        else:
+            endpoint = "GET /api/events"
+            response = await client.get("/api/events", params={"user_id": user_id})
+        status = str(response.status_code)
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    results.record(endpoint, time.perf_counter() - start, status)
+
+
+async def worker(client: httpx.AsyncClient, args, results: Results, deadline: float):
+    while time.perf_counter() < deadline:
+        await one_request(client, args, results)
+
+
+async def probe(client: httpx.AsyncClient, args, results: Results, deadline: float):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            await client.get("/")
+            results.probe_latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(args.probe_interval)
+
+
+async def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url, timeout=1.0)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def spawn_servers(args) -> List[subprocess.Popen]:
+    mock = subprocess.Popen([
+        sys.executable, os.path.join(BACKEND_DIR, "bench", "mock_openai.py"),
+        "--port", str(args.mock_port),
+        "--latency", args.mock_latency,
+        "--median", str(args.mock_median),
+        "--spread", str(args.mock_spread),
+        "--malformed-rate", str(args.mock_malformed_rate),
+        "--empty-rate", str(args.mock_empty_rate),
+    ])
+
+    env = {
+        **os.environ,
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.mock_port}/v1",
+        "OPENAI_API_KEY": "bench",
+        "VITE_SUPABASE_URL": os.environ.get("VITE_SUPABASE_URL", "http://127.0.0.1:9"),
+        "VITE_SUPABASE_ANON_KEY": os.environ.get("VITE_SUPABASE_ANON_KEY", DUMMY_SUPABASE_KEY),
+        "EVENT_STORE": "sqlite",
+        "EVENT_STORE_DB": os.path.join(BACKEND_DIR, "bench", "events.db"),
+        "USER_RATE_PER_SEC": "1000",
+        "USER_BURST": "1000",
+        "GLOBAL_RATE_PER_SEC": "100000",
+        "GLOBAL_BURST": "100000",
+        "LOG_LEVEL": "WARNING",
+        # The driver sends no access tokens; act as the user_id in each request
+        "AUTH_ALLOW_ANONYMOUS": "1",
+    }
+    backend = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app:app",
+        "--port", str(args.backend_port), "--log-level", "warning",
+    ], cwd=BACKEND_DIR, env=env)
+    return [mock, backend]
+
+
+async def run(args) -> dict:
+    processes: List[subprocess.Popen] = []
+    target = args.target
+    if args.spawn:
+        processes = spawn_servers(args)
+        target = f"http://127.0.0.1:{args.backend_port}"
+    try:
+        if args.spawn:
+            await wait_until_up(f"http://127.0.0.1:{args.mock_port}/docs")
+        await wait_until_up(f"{target}/")
+
+        limits = httpx.Limits(max_connections=args.concurrency + 4,
+                              max_keepalive_connections=args.concurrency + 4)
+        results = Results()
+        async with httpx.AsyncClient(base_url=target, limits=limits,
+                                     timeout=args.timeout) as client:
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(
+                probe(client, args, results, deadline),
+                *(worker(client, args, results, deadline) for _ in range(args.concurrency)),
+            )
+            elapsed = time.perf_counter() - start
+        return results.report(elapsed)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+def print_report(report: dict):
+    print(f"\n{report['total_requests']} requests in {report['duration_s']}s "
+          f"({report['total_rps']} req/s)\n")
+    header = f"{'endpoint':<32}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  statuses"
+    print(header)
+    print("-" * len(header))
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:<32}{stats['rps']:>8}{stats['p50_ms']:>9}{stats['p95_ms']:>9}"
+              f"{stats['p99_ms']:>9}{stats['max_ms']:>9}  {stats['statuses']}")
+    lag = report["event_loop_lag"]
+    print(f"\nevent-loop lag (ms, {lag['samples']} probes): p50 {lag['p50_ms']}  "
+          f"p95 {lag['p95_ms']}  p99 {lag['p99_ms']}  max {lag['max_ms']}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--probe-interval", type=float, default=0.1)
+    parser.add_argument("--allow-cache", action="store_true")
+    parser.add_argument("--weight-brain-dump", type=float, default=0.5)
+    parser.add_argument("--weight-process-events", type=float, default=0.1)
+    parser.add_argument("--weight-events", type=float, default=0.4)
+    parser.add_argument("--json", dest="json_out", help="also write the report here")
+
+    spawn = parser.add_argument_group("spawned servers")
+    spawn.add_argument("--spawn", action="store_true",
+                       help="start the mock OpenAI server and the backend locally")
+    spawn.add_argument("--backend-port", type=int, default=8000)
+    spawn.add_argument("--mock-port", type=int, default=8001)
+    spawn.add_argument("--mock-latency", choices=["fixed", "uniform", "lognormal"],
+                       default="lognormal")
+    spawn.add_argument("--mock-median", type=float, default=1.0)
+    spawn.add_argument("--mock-spread", type=float, default=0.5)
+    spawn.add_argument("--mock-malformed-rate", type=float, default=0.02)
+    spawn.add_argument("--mock-empty-rate", type=float, default=0.02)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
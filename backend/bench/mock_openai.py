@@ -0,0 +1,173 @@
+"""
+Local stand-in for the OpenAI chat-completions API, for offline benchmarks.
+
+    python bench/mock_openai.py --port 8001 --latency lognormal --median 1.5 \
+        --malformed-rate 0.05 --empty-rate 0.02
+
+Then start the backend with OPENAI_BASE_URL=http://localhost:8001/v1.
+
+Latency is drawn per request from a fixed, uniform or lognormal distribution.
+Streaming requests get the same body split into SSE chunks spread over the
+sampled latency. Responses are canned events dated from the request's
+"TODAY IS" line; a configurable share are malformed JSON or empty arrays.
+Honors response_format (json_schema -> {"events": [...]}) and reports usage.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI(title="Mock OpenAI")
+CONFIG = argparse.Namespace(
+    latency="fixed", median=1.0, spread=0.5, first_token=0.3,
+    malformed_rate=0.0, empty_rate=0.0, chunk_chars=24,
+)
+
+TODAY_PATTERN = re.compile(r"TODAY IS: (\d{4}-\d{2}-\d{2})")
+TEXT_PATTERN = re.compile(r'Text to parse: "(.*)"', re.DOTALL)
+
+
+def sample_latency() -> float:
+    if CONFIG.latency == "uniform":
+        low = max(0.0, CONFIG.median - CONFIG.spread)
+        return random.uniform(low, CONFIG.median + CONFIG.spread)
+    if CONFIG.latency == "lognormal":
+        return random.lognormvariate(math.log(max(CONFIG.median, 1e-3)), CONFIG.spread)
+    return CONFIG.median
+
+
+def canned_events(messages) -> list:
+    user_content = " ".join(
+        m.get("content", "") for m in messages if m.get("role") == "user")
+    today_match = TODAY_PATTERN.search(user_content)
+    today = (datetime.strptime(today_match.group(1), "%Y-%m-%d")
+             if today_match else datetime.now())
+    text_match = TEXT_PATTERN.search(user_content)
+    text = text_match.group(1) if text_match else "task"
+
+    # One event per clause, like the real model would roughly return
+    clauses = [c.strip() for c in re.split(r",|;|\band\b|\.", text) if c.strip()]
+    return [
+        {
+            "title": clause[:40].title(),
+            "description": f"Event: {clause}",
+            "date": (today + timedelta(days=i + 1)).strftime("%Y-%m-%d"),
+            "time": "14:00" if i % 2 else None,
+            "priority": "medium",
+            "recurrence": None,
+        }
+        for i, clause in enumerate(clauses[:12])
+    ]
+
+
+def completion_body(payload: dict) -> str:
+    roll = random.random()
+    if roll < CONFIG.malformed_rate:
+        return '[{"title": "Broken", "date": "2025-01-0'
+    events = [] if roll < CONFIG.malformed_rate + CONFIG.empty_rate else canned_events(
+        payload.get("messages", []))
+
+    response_format = payload.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return json.dumps({"events": events})
+    return "```json\n" + json.dumps(events) + "\n```"
+
+
+def usage_for(payload: dict, body: str) -> dict:
+    # ~4 characters per token is close enough for relative comparisons
+    prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+    prompt_tokens = prompt_chars // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": len(body) // 4,
+        "total_tokens": prompt_tokens + len(body) // 4,
+        "prompt_tokens_details": {"cached_tokens": 0},
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    payload = await request.json()
+    body = completion_body(payload)
+    latency = sample_latency()
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+    model = payload.get("model", "mock")
+
+    if not payload.get("stream"):
+        await asyncio.sleep(latency)
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": body},
+                "finish_reason": "stop",
+            }],
+            "usage": usage_for(payload, body),
+        })
+
+    async def sse_chunks():
+        chunks = [body[i:i + CONFIG.chunk_chars]
+                  for i in range(0, len(body), CONFIG.chunk_chars)] or [""]
+        first = min(CONFIG.first_token, latency)
+        await asyncio.sleep(first)
+        gap = (latency - first) / max(len(chunks), 1)
+        for chunk in chunks:
+            data = {
+                "id": completion_id, "object": "chat.completion.chunk",
+                "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(data)}\n\n"
+            await asyncio.sleep(gap)
+        final = {
+            "id": completion_id, "object": "chat.completion.chunk",
+            "created": created, "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            usage = {
+                "id": completion_id, "object": "chat.completion.chunk",
+                "created": created, "model": model, "choices": [],
+                "usage": usage_for(payload, body),
+            }
+            yield f"data: {json.dumps(usage)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(sse_chunks(), media_type="text/event-stream")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="fixed")
+    parser.add_argument("--median", type=float, default=1.0,
+                        help="fixed/median latency in seconds")
+    parser.add_argument("--spread", type=float, default=0.5,
+                        help="uniform half-width, or lognormal sigma")
+    parser.add_argument("--first-token", type=float, default=0.3,
+                        help="seconds before the first streamed chunk")
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--empty-rate", type=float, default=0.0)
+    parser.add_argument("--chunk-chars", type=int, default=24)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    vars(CONFIG).update(vars(args))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,131 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday",
+            "friday", "saturday", "sunday"]
+
+MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3,
+    "april": 4, "apr": 4, "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7,
+    "august": 8, "aug": 8, "september": 9, "sept": 9, "sep": 9,
+    "october": 10, "oct": 10, "november": 11, "nov": 11,
+    "december": 12, "dec": 12,
+}
+
+_WEEKDAY = "|".join(WEEKDAYS)
+# Longest names first so "september" wins over "sep"
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+# One combined pattern so overlapping phrases resolve to the longest match
+TEMPORAL_PATTERN = re.compile(
+    rf"""
+    \b(?:
+        (?P<day_after>day\ after\ tomorrow)
+      | (?P<relative>tomorrow|today|tonight)
+      | end\ of\ (?:the\ )?(?P<end_rel>this|next)?\ ?(?P<end_unit>week|month)
+      | end\ of\ (?P<end_month>{_MONTH})
+      | (?P<modifier>next|this)\ (?P<mod_weekday>{_WEEKDAY})
+      | (?P<month>{_MONTH})\.?\ (?P<month_day>\d{{1,2}})(?:st|nd|rd|th)?
+      | (?P<day_first>\d{{1,2}})(?:st|nd|rd|th)?\ of\ (?P<day_month>{_MONTH})
+      | (?P<weekday>{_WEEKDAY})s?
+    )\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def upcoming_weekday(today: date, target: int) -> date:
+    """
+    Next occurrence of target weekday. Saying today's weekday means next week.
+    """
+    days_to_add = (target - today.weekday()) % 7
+    return today + timedelta(days=days_to_add or 7)
+
+
+def next_weekday(today: date, target: int) -> date:
+    """
+    "next <weekday>" always lands in the following week (at least 7 days away)
+    """
+    current = today.weekday()
+    if target >= current:
+        return today + timedelta(days=7 + (target - current))
+    return today + timedelta(days=7 + (7 - current) + target)
+
+
+def end_of_month(year: int, month: int) -> date:
+    first_of_next = date(year + month // 12, month % 12 + 1, 1)
+    return first_of_next - timedelta(days=1)
+
+
+def _month_day(today: date, month: int, day: int) -> Optional[date]:
+    """
+    Month/day without a year: this year, or next year if it already passed
+    """
+    try:
+        resolved = date(today.year, month, day)
+        if resolved < today:
+            resolved = date(today.year + 1, month, day)
+    except ValueError:
+        return None
+    return resolved
+
+
+def _resolve_match(match: re.Match, today: date) -> Optional[date]:
+    groups = {k: (v.lower() if v else v) for k, v in match.groupdict().items()}
+
+    if groups["day_after"]:
+        return today + timedelta(days=2)
+    if groups["relative"]:
+        return today + timedelta(days=1 if groups["relative"] == "tomorrow" else 0)
+    if groups["end_unit"]:
+        if groups["end_unit"] == "week":
+            this_sunday = today + timedelta(days=6 - today.weekday())
+            return this_sunday + timedelta(days=7 if groups["end_rel"] == "next" else 0)
+        if groups["end_rel"] == "next":
+            month = today.month % 12 + 1
+            return end_of_month(today.year + (today.month == 12), month)
+        return end_of_month(today.year, today.month)
+    if groups["end_month"]:
+        month = MONTHS[groups["end_month"]]
+        year = today.year + (month < today.month)
+        return end_of_month(year, month)
+    if groups["mod_weekday"]:
+        target = WEEKDAYS.index(groups["mod_weekday"])
+        if groups["modifier"] == "next":
+            return next_weekday(today, target)
+        if target == today.weekday():
+            return today
+        return upcoming_weekday(today, target)
+    if groups["month"]:
+        return _month_day(today, MONTHS[groups["month"]], int(groups["month_day"]))
+    if groups["day_month"]:
+        return _month_day(today, MONTHS[groups["day_month"]], int(groups["day_first"]))
+    if groups["weekday"]:
+        return upcoming_weekday(today, WEEKDAYS.index(groups["weekday"]))
+    return None
+
+
+def resolve_dates(text: str, current_date: datetime) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Find temporal expressions in text and resolve each to an ISO date relative
+    to current_date. Returns the text with every resolved span annotated as
+    "friday [2025-09-12]", plus the list of (span, iso_date) pairs.
+    """
+    today = current_date.date()
+    resolutions = []
+    pieces = []
+    last_end = 0
+
+    for match in TEMPORAL_PATTERN.finditer(text):
+        resolved = _resolve_match(match, today)
+        if resolved is None:
+            continue
+        iso = resolved.strftime('%Y-%m-%d')
+        resolutions.append((match.group(0), iso))
+        pieces.append(text[last_end:match.end()])
+        pieces.append(f" [{iso}]")
+        last_end = match.end()
+
+    pieces.append(text[last_end:])
+    return "".join(pieces), resolutions
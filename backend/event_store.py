@@ -0,0 +1,283 @@
+"""
+Event persistence for the calendar.
+
+Two backends share one interface:
+  - SupabaseEventStore: production, uses a service-role supabase client and
+    an "events" table (id text primary key, user_id text, title text,
+    description text, date date, time text, priority text, seq bigint,
+    deleted boolean default false, created_at timestamptz default now())
+    with indexes on (user_id, date) and (user_id, seq). Change sequences come
+    from a "next_event_seq(p_user_id text, p_count int) returns bigint"
+    function that atomically bumps a per-user counter and returns the new value.
+    Writes go through add_events_with_seq() and tombstone_event(), which take
+    the sequence and write the rows in one transaction, so rows commit in
+    seq order and a cursor never skips a slower writer's rows. The DDL,
+    functions and row level security policies are in migrations/.
+  - SQLiteEventStore: local file for tests and offline runs.
+
+Every insert or delete takes the next value of a per-user change sequence.
+Deletes leave a tombstone row (deleted = true) so delta sync can report them.
+
+Methods are synchronous; the app calls them through asyncio.to_thread.
+"""
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from interval_index import parse_time_of_day
+
+EVENT_FIELDS = ("id", "title", "description", "date", "time", "priority")
+
+
+def month_range(month: str) -> Tuple[str, str]:
+    """
+    "2025-09" -> ("2025-09-01", "2025-10-01"), a half-open date range
+    """
+    start = datetime.strptime(month, "%Y-%m").date()
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start.isoformat(), end.isoformat()
+
+
+def chronological(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Sort by date, then time of day; times are stored as 12-hour text
+    ("10:00 AM" sorts before "9:00 AM" as a string), so they're compared as
+    minutes. Untimed (all-day) events come first on their date.
+    """
+    def key(event: Dict[str, Any]) -> Tuple[str, int]:
+        minute_of_day = parse_time_of_day(event.get("time"))
+        return event.get("date") or "", -1 if minute_of_day is None else minute_of_day
+    return sorted(events, key=key)
+
+
+class EventStore(ABC):
+    @abstractmethod
+    def add_events(self, user_id: str, events: List[Dict[str, Any]]) -> int:
+        """
+        Insert or replace events; returns how many were written
+        """
+
+    @abstractmethod
+    def list_events(self, user_id: str, month: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Live events in chronological order, optionally for one "YYYY-MM" month
+        """
+
+    @abstractmethod
+    def delete_event(self, event_id: str, user_id: Optional[str] = None) -> bool:
+        """
+        Tombstone the event; with user_id, only if it belongs to that user
+        """
+
+    @abstractmethod
+    def current_seq(self, user_id: str) -> int:
+        """
+        Latest change sequence for the user (0 if nothing ever changed)
+        """
+
+    @abstractmethod
+    def changes_since(self, user_id: str, since: int, month: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Events added/changed and ids deleted after change sequence `since`
+        """
+
+
+class SQLiteEventStore(EventStore):
+    def __init__(self, path: str = "events.db"):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, title TEXT NOT NULL, "
+                "description TEXT, date TEXT NOT NULL, time TEXT, priority TEXT, "
+                "seq INTEGER NOT NULL DEFAULT 0, deleted INTEGER NOT NULL DEFAULT 0, "
+                "created_at TEXT NOT NULL)"
+            )
+            # Databases created before change sequences existed
+            columns = {row[1] for row in self.db.execute("PRAGMA table_info(events)")}
+            if "seq" not in columns:
+                self.db.execute(
+                    "ALTER TABLE events ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+                self.db.execute(
+                    "ALTER TABLE events ADD COLUMN deleted INTEGER NOT NULL DEFAULT 0")
+            self.db.execute(
+                "CREATE INDEX IF NOT EXISTS events_user_date ON events (user_id, date)")
+            self.db.execute(
+                "CREATE INDEX IF NOT EXISTS events_user_seq ON events (user_id, seq)")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS event_seq ("
+                "user_id TEXT PRIMARY KEY, seq INTEGER NOT NULL)"
+            )
+            self.db.commit()
+
+    def _bump_seq(self, user_id: str, count: int) -> int:
+        """
+        Reserve `count` sequence numbers for the user; returns the last one.
+        Caller must hold the lock.
+        """
+        self.db.execute(
+            "INSERT INTO event_seq (user_id, seq) VALUES (?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET seq = seq + excluded.seq",
+            (user_id, count)
+        )
+        return self.db.execute(
+            "SELECT seq FROM event_seq WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    def add_events(self, user_id: str, events: List[Dict[str, Any]]) -> int:
+        if not events:
+            return 0
+        created_at = datetime.now().isoformat()
+        with self.lock:
+            first_seq = self._bump_seq(user_id, len(events)) - len(events) + 1
+            rows = [
+                (event["id"], user_id, event["title"], event.get("description", ""),
+                 event["date"], event.get("time"), event.get("priority", "medium"),
+                 first_seq + i, created_at)
+                for i, event in enumerate(events)
+            ]
+            self.db.executemany(
+                "INSERT OR REPLACE INTO events "
+                "(id, user_id, title, description, date, time, priority, seq, deleted, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?)",
+                rows
+            )
+            self.db.commit()
+        return len(rows)
+
+    def list_events(self, user_id: str, month: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = ("SELECT id, title, description, date, time, priority FROM events "
+                 "WHERE user_id = ? AND deleted = 0")
+        params: List[Any] = [user_id]
+        if month:
+            start, end = month_range(month)
+            query += " AND date >= ? AND date < ?"
+            params += [start, end]
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+        return chronological([dict(row) for row in rows])
+
+    def delete_event(self, event_id: str, user_id: Optional[str] = None) -> bool:
+        query = "SELECT user_id FROM events WHERE id = ? AND deleted = 0"
+        params: List[Any] = [event_id]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        with self.lock:
+            row = self.db.execute(query, params).fetchone()
+            if row is None:
+                return False
+            seq = self._bump_seq(row["user_id"], 1)
+            self.db.execute(
+                "UPDATE events SET deleted = 1, seq = ? WHERE id = ?", (seq, event_id))
+            self.db.commit()
+        return True
+
+    def current_seq(self, user_id: str) -> int:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT seq FROM event_seq WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else 0
+
+    def changes_since(self, user_id: str, since: int, month: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+        query = ("SELECT id, title, description, date, time, priority, deleted FROM events "
+                 "WHERE user_id = ? AND seq > ?")
+        params: List[Any] = [user_id, since]
+        if month:
+            start, end = month_range(month)
+            query += " AND date >= ? AND date < ?"
+            params += [start, end]
+        query += " ORDER BY seq"
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+        changed = [
+            {k: row[k] for k in EVENT_FIELDS} for row in rows if not row["deleted"]
+        ]
+        deleted = [row["id"] for row in rows if row["deleted"]]
+        return changed, deleted
+
+
+class SupabaseEventStore(EventStore):
+    """
+    PostgREST caps every select at the project's max-rows setting (1000 by
+    default) without saying so, so reads are paged: page_size must not be
+    larger than that setting.
+    """
+
+    def __init__(self, client, table: str = "events", page_size: int = 1000):
+        self.client = client
+        self.table = table
+        self.page_size = page_size
+
+    def add_events(self, user_id: str, events: List[Dict[str, Any]]) -> int:
+        if not events:
+            return 0
+        rows = [{field: event.get(field) for field in EVENT_FIELDS} for event in events]
+        # Sequence and rows in one transaction, in one round trip
+        self.client.rpc(
+            "add_events_with_seq", {"p_user_id": user_id, "p_events": rows}).execute()
+        return len(rows)
+
+    def list_events(self, user_id: str, month: Optional[str] = None) -> List[Dict[str, Any]]:
+        def page(offset: int):
+            query = self.client.table(self.table).select(
+                ",".join(EVENT_FIELDS)).eq("user_id", user_id).eq("deleted", False)
+            if month:
+                start, end = month_range(month)
+                query = query.gte("date", start).lt("date", end)
+            # A total order, so pages neither overlap nor skip rows
+            query = query.order("date").order("id")
+            return query.range(offset, offset + self.page_size - 1).execute().data or []
+
+        events: List[Dict[str, Any]] = []
+        while True:
+            rows = page(len(events))
+            events.extend(rows)
+            if len(rows) < self.page_size:
+                return chronological(events)
+
+    def delete_event(self, event_id: str, user_id: Optional[str] = None) -> bool:
+        result = self.client.rpc(
+            "tombstone_event", {"p_event_id": event_id, "p_user_id": user_id}).execute()
+        return bool(result.data)
+
+    def current_seq(self, user_id: str) -> int:
+        # The counter only moves in the transaction that writes its rows
+        result = self.client.table("event_seq").select("seq").eq(
+            "user_id", user_id).limit(1).execute()
+        return result.data[0]["seq"] if result.data else 0
+
+    def changes_since(self, user_id: str, since: int, month: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+        rows: List[Dict[str, Any]] = []
+        last_seq = since
+        while True:
+            # Keyset paging on seq, which is unique per user
+            query = self.client.table(self.table).select(
+                ",".join(EVENT_FIELDS + ("deleted", "seq"))).eq(
+                "user_id", user_id).gt("seq", last_seq)
+            if month:
+                start, end = month_range(month)
+                query = query.gte("date", start).lt("date", end)
+            page = query.order("seq").limit(self.page_size).execute().data or []
+            rows.extend(page)
+            if len(page) < self.page_size:
+                break
+            last_seq = page[-1]["seq"]
+        changed = [
+            {k: row.get(k) for k in EVENT_FIELDS} for row in rows if not row.get("deleted")
+        ]
+        deleted = [row["id"] for row in rows if row.get("deleted")]
+        return changed, deleted
+
+
+def create_event_store(backend: str, supabase_client=None, sqlite_path: str = "events.db",
+                       page_size: int = 1000) -> EventStore:
+    if backend == "sqlite":
+        return SQLiteEventStore(sqlite_path)
+    if backend == "supabase":
+        return SupabaseEventStore(supabase_client, page_size=page_size)
+    raise ValueError(f"Unknown EVENT_STORE backend: {backend}")
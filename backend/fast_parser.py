@@ -0,0 +1,185 @@
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from date_resolver import TEMPORAL_PATTERN, resolve_dates
+
+DEADLINE_PATTERN = re.compile(
+    r"\b(?:due(?:\s+(?:by|on))?|deadline(?:\s+(?:is|on))?|submit(?:\s+by)?|finish(?:\s+by)?)\b",
+    re.IGNORECASE,
+)
+
+# Anything that needs the LLM: repeats, counts, several tasks in one line
+ESCALATE_PATTERN = re.compile(
+    r"\b(?:every|until|daily|weekly|monthly|each|through|thru|"
+    r"and|also|then|plus|between|from)\b|[,;\n]|\d+\s+\w+s\b",
+    re.IGNORECASE,
+)
+
+TIME_PATTERN = re.compile(
+    r"\b(?:at\s+)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>am|pm|a\.m\.|p\.m\.)"
+    r"|\b(?:at\s+)(?P<bare_hour>\d{1,2})(?::(?P<bare_minute>\d{2}))?\b"
+    r"|\b(?:at\s+)?(?P<named>noon|midnight)\b",
+    re.IGNORECASE,
+)
+
+# Stands in for a removed date/time/deadline phrase while the title is cleaned
+REMOVED = "\x00"
+
+# Prepositions left dangling in front of a removed phrase ("meet on [friday]")
+FILLER_BEFORE_REMOVED = re.compile(
+    r"(?:\b(?:on|at|by|for|the|this|next|is)\s+)+" + REMOVED,
+    re.IGNORECASE,
+)
+
+LEADING_INTENT_PATTERN = re.compile(
+    r"^\s*(?:i\s+)?(?:need|have|want|got)\s+to\b|^\s*remember\s+to\b",
+    re.IGNORECASE,
+)
+
+# A number or time word still in the title means a time the rules didn't
+# understand ("dinner friday 7", "gym tomorrow morning")
+STRAY_TIME_PATTERN = re.compile(
+    r"\b\d+\b|\b(?:morning|afternoon|evening|night|noon|midnight|o'?clock|am|pm)\b",
+    re.IGNORECASE,
+)
+STRAY_TIME_PENALTY = 0.5
+
+MAX_FAST_PATH_LENGTH = 80
+MAX_TITLE_WORDS = 6
+
+
+def _parse_time(text: str) -> Tuple[Optional[str], Optional[re.Match], float]:
+    """
+    Extract one time of day as HH:MM. Returns (time, match, confidence_penalty).
+    """
+    matches = list(TIME_PATTERN.finditer(text))
+    if not matches:
+        return None, None, 0.0
+    if len(matches) > 1:
+        return None, None, 1.0
+
+    match = matches[0]
+    time_24, penalty = _time_from_match(match)
+    if time_24 is None:
+        return None, None, 1.0
+    return time_24, match, penalty
+
+
+def _time_from_match(match: re.Match) -> Tuple[Optional[str], float]:
+    """
+    One TIME_PATTERN match as (HH:MM, confidence_penalty); None if invalid
+    """
+    if match.group("named"):
+        return ("12:00" if match.group("named").lower() == "noon" else "00:00"), 0.0
+
+    if match.group("hour"):
+        hour = int(match.group("hour"))
+        minute = int(match.group("minute") or 0)
+        if hour > 12 or minute > 59:
+            return None, 1.0
+        is_pm = match.group("meridiem").lower().startswith("p")
+        hour = hour % 12 + (12 if is_pm else 0)
+        return f"{hour:02d}:{minute:02d}", 0.0
+
+    # "at 3" with no am/pm: guess afternoon for 1-7, but trust it less
+    hour = int(match.group("bare_hour"))
+    minute = int(match.group("bare_minute") or 0)
+    if hour > 23 or minute > 59:
+        return None, 1.0
+    if 1 <= hour <= 7:
+        hour += 12
+    return f"{hour:02d}:{minute:02d}", 0.1
+
+
+def mentioned_times(text: str) -> List[str]:
+    """
+    Every time of day the user wrote in text, as HH:MM, once per mention
+    """
+    times = []
+    for match in TIME_PATTERN.finditer(text):
+        time_24, _ = _time_from_match(match)
+        if time_24 is not None:
+            times.append(time_24)
+    return times
+
+
+def _clean_title(text: str) -> str:
+    """
+    Drop removed phrases with the prepositions that led into them and a
+    leading "I need to"; words elsewhere ("go to the bank") stay
+    """
+    title = FILLER_BEFORE_REMOVED.sub(REMOVED, text)
+    title = LEADING_INTENT_PATTERN.sub(" ", title)
+    title = re.sub(r"[^\w\s'&-]", " ", title)
+    return " ".join(title.split())
+
+
+def fast_parse(text: str, current_date: datetime) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Rule-based first tier for one-liners like "dentist tomorrow at 3pm" or
+    "essay due friday". Returns (events_data, confidence) where events_data
+    uses the same dict shape GPT returns. Confidence 0 means "ask the LLM".
+    """
+    stripped = text.strip()
+    if not stripped or len(stripped) > MAX_FAST_PATH_LENGTH:
+        return [], 0.0
+    if ESCALATE_PATTERN.search(stripped):
+        return [], 0.0
+
+    _, resolutions = resolve_dates(stripped, current_date)
+    if len(resolutions) != 1:
+        return [], 0.0
+    date_str = resolutions[0][1]
+
+    time_24, time_match, penalty = _parse_time(stripped)
+    confidence = 1.0 - penalty
+    if confidence <= 0:
+        return [], 0.0
+
+    remainder = stripped
+    if time_match:
+        remainder = remainder[:time_match.start()] + REMOVED + remainder[time_match.end():]
+    remainder = TEMPORAL_PATTERN.sub(REMOVED, remainder)
+
+    is_deadline = bool(DEADLINE_PATTERN.search(remainder))
+    subject = _clean_title(DEADLINE_PATTERN.sub(REMOVED, remainder))
+    if not subject:
+        return [], 0.0
+
+    words = subject.split()
+    if len(words) > MAX_TITLE_WORDS:
+        confidence -= 0.1 * (len(words) - MAX_TITLE_WORDS)
+    if STRAY_TIME_PATTERN.search(subject):
+        confidence -= STRAY_TIME_PENALTY
+    subject = subject[0].upper() + subject[1:]
+
+    if not is_deadline:
+        return [{
+            "title": subject,
+            "description": f"Event: {stripped}",
+            "date": date_str,
+            "time": time_24,
+            "priority": "medium"
+        }], confidence
+
+    # Deadlines get one prep event the day before (never before today)
+    due_date = datetime.strptime(date_str, '%Y-%m-%d')
+    prep_date = max(due_date - timedelta(days=1),
+                    current_date.replace(hour=0, minute=0, second=0, microsecond=0))
+    return [
+        {
+            "title": f"Work on {subject}",
+            "description": f"Preparation for: {stripped}",
+            "date": prep_date.strftime('%Y-%m-%d'),
+            "time": None,
+            "priority": "high"
+        },
+        {
+            "title": f"{subject} Due",
+            "description": f"Deadline: {stripped}",
+            "date": date_str,
+            "time": time_24,
+            "priority": "high"
+        }
+    ], confidence
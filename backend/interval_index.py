@@ -0,0 +1,215 @@
+import asyncio
+import bisect
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minute(day: date, minute_of_day: int = 0) -> int:
+    """
+    Absolute minute number, so intervals on different days compare directly
+    """
+    return day.toordinal() * MINUTES_PER_DAY + minute_of_day
+
+
+def from_minute(minute: int) -> Tuple[str, str]:
+    """
+    Absolute minute -> ("YYYY-MM-DD", "HH:MM")
+    """
+    day = date.fromordinal(minute // MINUTES_PER_DAY)
+    hours, minutes = divmod(minute % MINUTES_PER_DAY, 60)
+    return day.isoformat(), f"{hours:02d}:{minutes:02d}"
+
+
+def parse_time_of_day(value: Optional[str]) -> Optional[int]:
+    """
+    "2:00 PM" (stored format) or "14:00" -> minutes after midnight; None if untimed
+    """
+    if not value:
+        return None
+    for fmt in ("%I:%M %p", "%H:%M"):
+        try:
+            parsed = datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+        return parsed.hour * 60 + parsed.minute
+    return None
+
+
+def event_interval(event: Dict[str, Any], duration: int) -> Optional[Tuple[int, int]]:
+    """
+    [start, end) of a timed event; untimed (all-day) events don't block time
+    """
+    minute_of_day = parse_time_of_day(event.get("time"))
+    if minute_of_day is None:
+        return None
+    try:
+        day = date.fromisoformat(event.get("date") or "")
+    except ValueError:
+        return None
+    start = to_minute(day, minute_of_day)
+    return start, start + duration
+
+
+class IntervalIndex:
+    """
+    One user's timed events as a sorted array of (start, end, event_id).
+
+    Overlap queries bisect to the first interval that could still be running
+    (start >= query_start - longest interval) and walk forward only while
+    starts are before query_end, so they cost O(log n + k) for k overlaps
+    instead of a scan. Inserts and removals are a bisect plus a list shift.
+    """
+
+    def __init__(self):
+        self.intervals: List[Tuple[int, int, str]] = []
+        self.by_id: Dict[str, Tuple[int, int, str]] = {}
+        self.titles: Dict[str, str] = {}
+        # Never shrinks on removal; a stale larger bound is still correct
+        self.max_length = 0
+        self.seq = 0
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def add(self, event_id: str, start: int, end: int, title: str = ""):
+        self.remove(event_id)
+        entry = (start, end, event_id)
+        bisect.insort(self.intervals, entry)
+        self.by_id[event_id] = entry
+        self.titles[event_id] = title
+        self.max_length = max(self.max_length, end - start)
+
+    def remove(self, event_id: str):
+        entry = self.by_id.pop(event_id, None)
+        if entry is None:
+            return
+        position = bisect.bisect_left(self.intervals, entry)
+        if position < len(self.intervals) and self.intervals[position] == entry:
+            del self.intervals[position]
+        self.titles.pop(event_id, None)
+
+    def add_event(self, event: Dict[str, Any], duration: int):
+        """
+        Index a stored event dict (id, title, date, time); untimed ones are skipped
+        """
+        interval = event_interval(event, duration)
+        if interval is None:
+            self.remove(event["id"])
+        else:
+            self.add(event["id"], interval[0], interval[1], event.get("title", ""))
+
+    def overlapping(self, start: int, end: int) -> Iterator[Tuple[int, int, str]]:
+        intervals = self.intervals
+        position = bisect.bisect_left(intervals, (start - self.max_length,))
+        while position < len(intervals) and intervals[position][0] < end:
+            if intervals[position][1] > start:
+                yield intervals[position]
+            position += 1
+
+    def first_overlap_end(self, start: int, end: int) -> Optional[int]:
+        """
+        Latest end among intervals overlapping [start, end), None if it's free
+        """
+        ends = [entry[1] for entry in self.overlapping(start, end)]
+        return max(ends) if ends else None
+
+
+def find_free_slot(indexes: Sequence[IntervalIndex], duration: int, not_before: int,
+                   deadline: int, day_start: int = 9 * 60,
+                   day_end: int = 21 * 60) -> Optional[int]:
+    """
+    Earliest start >= not_before of a free `duration`-minute slot that ends by
+    deadline and stays within [day_start, day_end) of its day, checked against
+    every index. Each step jumps past a busy block or to the next day, so the
+    cost is O((blocks skipped + days) * log n).
+    """
+    candidate = not_before
+    while candidate + duration <= deadline:
+        minute_of_day = candidate % MINUTES_PER_DAY
+        day_base = candidate - minute_of_day
+        if minute_of_day < day_start:
+            candidate = day_base + day_start
+            continue
+        if minute_of_day + duration > day_end:
+            candidate = day_base + MINUTES_PER_DAY + day_start
+            continue
+
+        busy_until = None
+        for index in indexes:
+            end = index.first_overlap_end(candidate, candidate + duration)
+            if end is not None and (busy_until is None or end > busy_until):
+                busy_until = end
+        if busy_until is None:
+            return candidate
+        candidate = busy_until
+    return None
+
+
+class CalendarIndexes:
+    """
+    Per-user IntervalIndex over persisted events, kept for up to max_users
+    users (LRU). The first lookup for a user loads their events once; later
+    lookups compare the store's change sequence and apply only the delta
+    (changes_since), so a large calendar is never rescanned per brain dump.
+    """
+
+    def __init__(self, store, event_minutes: int = 60, max_users: int = 1000):
+        self.store = store
+        self.event_minutes = event_minutes
+        self.max_users = max_users
+        self.indexes: "OrderedDict[str, IntervalIndex]" = OrderedDict()
+        self.stats = {"builds": 0, "delta_updates": 0, "fresh_hits": 0}
+
+    async def get(self, user_id: str) -> IntervalIndex:
+        seq = await asyncio.to_thread(self.store.current_seq, user_id)
+        index = self.indexes.get(user_id)
+
+        if index is None:
+            # Build off the event loop; the new index isn't shared until it's done
+            events = await asyncio.to_thread(self.store.list_events, user_id)
+            index = await asyncio.to_thread(self._build, events)
+            index.seq = seq
+            self.stats["builds"] += 1
+        elif index.seq < seq:
+            changed, deleted = await asyncio.to_thread(
+                self.store.changes_since, user_id, index.seq)
+            # Another request may have applied a newer delta meanwhile
+            if index.seq < seq:
+                for event in changed:
+                    index.add_event(event, self.event_minutes)
+                for event_id in deleted:
+                    index.remove(event_id)
+                index.seq = seq
+            self.stats["delta_updates"] += 1
+        else:
+            self.stats["fresh_hits"] += 1
+
+        self.indexes[user_id] = index
+        self.indexes.move_to_end(user_id)
+        while len(self.indexes) > self.max_users:
+            self.indexes.popitem(last=False)
+        return index
+
+    def _build(self, events: List[Dict[str, Any]]) -> IntervalIndex:
+        index = IntervalIndex()
+        entries = []
+        for event in events:
+            interval = event_interval(event, self.event_minutes)
+            if interval is None:
+                continue
+            entry = (interval[0], interval[1], event["id"])
+            entries.append(entry)
+            index.by_id[event["id"]] = entry
+            index.titles[event["id"]] = event.get("title", "")
+        # One sort instead of n inserts
+        entries.sort()
+        index.intervals = entries
+        index.max_length = self.event_minutes if entries else 0
+        return index
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "users": len(self.indexes),
+                "intervals": sum(len(index) for index in self.indexes.values())}
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobQueue:
+    """
+    In-process job queue with a bounded worker pool and per-user fairness.
+
+    Each user has their own FIFO; workers take jobs round-robin across users
+    with pending work, so one user submitting a hundred dumps doesn't delay
+    everyone else's single dump. handler(user_id, payload) does the work and
+    its return value becomes the job result. Finished jobs are kept for
+    result_ttl seconds so clients can poll for them.
+    """
+
+    def __init__(self, handler: Callable[[str, Any], Awaitable[Any]], workers: int = 8,
+                 max_pending: int = 10000, result_ttl: float = 3600):
+        self.handler = handler
+        self.worker_count = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.finished_events: Dict[str, asyncio.Event] = {}
+        self.payloads: Dict[str, Any] = {}
+        self.finished_order: Deque[str] = deque()
+        self.user_queues: Dict[str, Deque[str]] = {}
+        self.ready_users: Deque[str] = deque()
+        self.pending = 0
+        self.available: Optional[asyncio.Semaphore] = None
+        self.workers = []
+
+    def start(self):
+        """
+        Start the worker tasks; call from inside the running event loop
+        """
+        self.available = asyncio.Semaphore(0)
+        self.workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.worker_count)
+        ]
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def submit(self, user_id: str, payload: Any) -> Dict[str, Any]:
+        self._prune()
+        if self.pending >= self.max_pending:
+            raise QueueFull()
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "user_id": user_id,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+        self.jobs[job_id] = job
+        self.finished_events[job_id] = asyncio.Event()
+        self.payloads[job_id] = payload
+
+        queue = self.user_queues.setdefault(user_id, deque())
+        if not queue:
+            self.ready_users.append(user_id)
+        queue.append(job_id)
+        self.pending += 1
+        self.available.release()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Long-poll: return the job once it finishes or after timeout seconds
+        """
+        finished = self.finished_events.get(job_id)
+        if finished is None:
+            return None
+        try:
+            await asyncio.wait_for(finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.jobs.get(job_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "users_waiting": len(self.ready_users),
+            "workers": self.worker_count,
+            "tracked_jobs": len(self.jobs),
+        }
+
+    def _next_job_id(self) -> str:
+        user_id = self.ready_users.popleft()
+        queue = self.user_queues[user_id]
+        job_id = queue.popleft()
+        if queue:
+            # Back of the line until every other waiting user got a turn
+            self.ready_users.append(user_id)
+        else:
+            del self.user_queues[user_id]
+        self.pending -= 1
+        return job_id
+
+    async def _worker(self):
+        while True:
+            await self.available.acquire()
+            job_id = self._next_job_id()
+            job = self.jobs[job_id]
+            payload = self.payloads.pop(job_id)
+            job["status"] = "running"
+            try:
+                job["result"] = await self.handler(job["user_id"], payload)
+                job["status"] = "done"
+            except asyncio.CancelledError:
+                job["status"] = "failed"
+                job["error"] = "Job cancelled"
+                raise
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = str(e)
+            finally:
+                job["finished_at"] = time.time()
+                self.finished_order.append(job_id)
+                self.finished_events[job_id].set()
+
+    def _prune(self):
+        # Jobs finish in finished_order order, so expired ones are at the front
+        cutoff = time.time() - self.result_ttl
+        while self.finished_order and self.jobs[self.finished_order[0]]["finished_at"] < cutoff:
+            job_id = self.finished_order.popleft()
+            del self.jobs[job_id]
+            del self.finished_events[job_id]
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from openai.types.chat import ChatCompletion
+
+# Completion arguments that decide what the model returns; anything else
+# (timeouts, extra headers) doesn't belong in the fixture key
+KEY_FIELDS = ("model", "messages", "temperature", "max_tokens", "response_format")
+
+
+class FixtureMissing(Exception):
+    pass
+
+
+class LLMReplay:
+    """
+    Record/replay layer for chat completions.
+
+    mode "off" passes calls straight through. "record" makes the real call
+    and saves request + response + latency as <fixture_dir>/<key>.json.
+    "replay" answers from those files without touching the network and
+    raises FixtureMissing when a request was never recorded. The key is a
+    hash of the request, so any prompt change needs a fresh recording.
+    """
+
+    def __init__(self, mode: str = "off", fixture_dir: str = "bench/fixtures"):
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown LLM replay mode: {mode}")
+        self.mode = mode
+        self.fixture_dir = fixture_dir
+        self.stats = {"recorded": 0, "replayed": 0, "missing": 0,
+                      "recorded_latency_s": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @staticmethod
+    def request_key(kwargs: Dict[str, Any]) -> str:
+        request = {field: kwargs.get(field) for field in KEY_FIELDS}
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+    def fixture_path(self, key: str) -> str:
+        return os.path.join(self.fixture_dir, f"{key}.json")
+
+    async def complete(self, kwargs: Dict[str, Any],
+                       call: Callable[[], Awaitable[ChatCompletion]]) -> ChatCompletion:
+        if self.mode == "off":
+            return await call()
+
+        key = self.request_key(kwargs)
+        path = self.fixture_path(key)
+
+        if self.mode == "replay":
+            try:
+                with open(path) as f:
+                    fixture = json.load(f)
+            except FileNotFoundError:
+                self.stats["missing"] += 1
+                raise FixtureMissing(f"No recorded completion for request {key}")
+            self.stats["replayed"] += 1
+            self.stats["recorded_latency_s"] += fixture.get("latency_s", 0.0)
+            return ChatCompletion.model_validate(fixture["response"])
+
+        start = time.perf_counter()
+        response = await call()
+        latency = time.perf_counter() - start
+
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        fixture = {
+            "key": key,
+            "request": {field: kwargs.get(field) for field in KEY_FIELDS},
+            "response": response.model_dump(mode="json"),
+            "latency_s": round(latency, 3),
+        }
+        with open(path, "w") as f:
+            json.dump(fixture, f, indent=2)
+        self.stats["recorded"] += 1
+        self.stats["recorded_latency_s"] += latency
+        return response
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"mode": self.mode, **self.stats}
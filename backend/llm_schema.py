@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+
+class LLMRecurrence(BaseModel):
+    weekdays: Optional[List[str]] = None
+    interval: Optional[int] = None
+    until: Optional[str] = None
+    count: Optional[int] = None
+
+
+class LLMEvent(BaseModel):
+    """
+    One event exactly as the model returns it (24-hour time, optional recurrence)
+    """
+    title: str
+    description: str = ""
+    date: str
+    time: Optional[str] = None
+    priority: str = "medium"
+    recurrence: Optional[LLMRecurrence] = None
+
+
+class LLMEventList(BaseModel):
+    events: List[LLMEvent]
+
+
+# Built once: validating through a cached adapter skips per-call schema setup
+LLM_EVENTS_ADAPTER = TypeAdapter(LLMEventList)
+
+_NULLABLE_STRING = {"type": ["string", "null"]}
+_NULLABLE_INT = {"type": ["integer", "null"]}
+
+# Strict JSON schema for OpenAI structured outputs. Strict mode needs every
+# property listed as required, so optional fields are nullable instead.
+EVENTS_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "calendar_events",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "required": ["events"],
+            "properties": {
+                "events": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "required": ["title", "description", "date", "time",
+                                     "priority", "recurrence"],
+                        "properties": {
+                            "title": {"type": "string"},
+                            "description": {"type": "string"},
+                            "date": {"type": "string", "pattern": r"^\d{4}-\d{2}-\d{2}$"},
+                            "time": _NULLABLE_STRING,
+                            "priority": {"type": "string", "enum": ["high", "medium", "low"]},
+                            "recurrence": {
+                                "anyOf": [
+                                    {"type": "null"},
+                                    {
+                                        "type": "object",
+                                        "additionalProperties": False,
+                                        "required": ["weekdays", "interval", "until", "count"],
+                                        "properties": {
+                                            "weekdays": {
+                                                "type": ["array", "null"],
+                                                "items": {"type": "string"}
+                                            },
+                                            "interval": _NULLABLE_INT,
+                                            "until": _NULLABLE_STRING,
+                                            "count": _NULLABLE_INT,
+                                        },
+                                    },
+                                ]
+                            },
+                        },
+                    },
+                }
+            },
+        },
+    },
+}
+
+
+def parse_structured_events(content: str) -> List[Dict[str, Any]]:
+    """
+    Validate a whole structured-output response in one pass and return plain
+    event dicts. Raises pydantic.ValidationError on malformed output.
+    """
+    parsed = LLM_EVENTS_ADAPTER.validate_json(content)
+    return [event.model_dump(exclude_none=True) for event in parsed.events]
@@ -0,0 +1,84 @@
+"""
+Leveled, structured (JSON lines) logging for the backend.
+
+Records go through a QueueHandler, and a background QueueListener thread does
+the actual stdout writes, so request handlers never block on log I/O.
+Payload logs (raw GPT output, full input text, per-event lines) are DEBUG and
+are additionally sampled with LOG_PAYLOAD_SAMPLE_RATE (0 drops them all).
+"""
+import json
+import logging
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Any, Optional
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class StructuredLogger:
+    """
+    Thin wrapper so call sites pass fields as keyword arguments:
+    log.info("parsed brain dump", events=3, tier="llm")
+    """
+
+    def __init__(self, logger: logging.Logger, payload_sample_rate: float = 0.0):
+        self.logger = logger
+        self.payload_sample_rate = payload_sample_rate
+
+    def _log(self, level: int, message: str, fields: dict, exc_info: Any = None):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, extra={"fields": fields}, exc_info=exc_info)
+
+    def debug(self, message: str, **fields):
+        self._log(logging.DEBUG, message, fields)
+
+    def info(self, message: str, **fields):
+        self._log(logging.INFO, message, fields)
+
+    def warning(self, message: str, **fields):
+        self._log(logging.WARNING, message, fields)
+
+    def error(self, message: str, exc_info: Any = None, **fields):
+        self._log(logging.ERROR, message, fields, exc_info)
+
+    def payload(self, message: str, **fields):
+        """
+        DEBUG-level log of request/response payloads, kept only for a sample
+        """
+        if self.payload_sample_rate <= 0 or not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if self.payload_sample_rate < 1 and random.random() >= self.payload_sample_rate:
+            return
+        self._log(logging.DEBUG, message, fields)
+
+
+def configure_logging(name: str, level: str = "INFO",
+                      payload_sample_rate: float = 0.0) -> "tuple[StructuredLogger, Optional[QueueListener]]":
+    logger = logging.getLogger(name)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+    listener = None
+    if not logger.handlers:
+        queue: SimpleQueue = SimpleQueue()
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter())
+        listener = QueueListener(queue, stream_handler)
+        logger.addHandler(QueueHandler(queue))
+        listener.start()
+
+    return StructuredLogger(logger, payload_sample_rate), listener
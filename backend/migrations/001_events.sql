@@ -0,0 +1,51 @@
+-- Event persistence for SupabaseEventStore (backend/event_store.py).
+--
+-- The backend writes with the service-role key (SUPABASE_SERVICE_ROLE_KEY),
+-- which bypasses row level security, and checks ownership itself. RLS is
+-- still enabled so the anon key and signed-in clients can only read their
+-- own rows and can't touch the sequence counter at all.
+
+create table if not exists public.events (
+    id          text primary key,
+    user_id     text not null,
+    title       text not null,
+    description text,
+    date        date not null,
+    time        text,
+    priority    text,
+    seq         bigint not null default 0,
+    deleted     boolean not null default false,
+    created_at  timestamptz not null default now()
+);
+
+create index if not exists events_user_date on public.events (user_id, date);
+create index if not exists events_user_seq on public.events (user_id, seq);
+
+-- Per-user change sequence; every insert or tombstone takes the next value
+create table if not exists public.event_seq (
+    user_id text primary key,
+    seq     bigint not null
+);
+
+-- Reserve p_count sequence numbers for the user and return the last one
+create or replace function public.next_event_seq(p_user_id text, p_count int)
+returns bigint
+language sql
+as $$
+    insert into public.event_seq as s (user_id, seq)
+    values (p_user_id, p_count)
+    on conflict (user_id) do update set seq = s.seq + excluded.seq
+    returning s.seq;
+$$;
+
+revoke execute on function public.next_event_seq(text, int) from public, anon, authenticated;
+grant execute on function public.next_event_seq(text, int) to service_role;
+
+alter table public.events enable row level security;
+alter table public.event_seq enable row level security;
+
+drop policy if exists "events are readable by their owner" on public.events;
+create policy "events are readable by their owner"
+    on public.events for select
+    to authenticated
+    using (user_id = auth.uid()::text);
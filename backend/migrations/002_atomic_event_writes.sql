@@ -0,0 +1,72 @@
+-- Take the change sequence and write the rows in one transaction.
+--
+-- next_event_seq() followed by a separate upsert let a later writer's rows
+-- commit before an earlier writer's, so a client could be handed a cursor
+-- past rows that hadn't landed yet and never receive them. Here the
+-- counter row stays locked until the rows are committed, so commit order
+-- matches seq order and event_seq.seq never runs ahead of visible rows.
+
+-- Insert or replace p_events (a JSON array of {id, title, description,
+-- date, time, priority}) for the user; returns the user's new sequence value
+create or replace function public.add_events_with_seq(p_user_id text, p_events jsonb)
+returns bigint
+language plpgsql
+as $$
+declare
+    v_count int := jsonb_array_length(p_events);
+    v_last bigint;
+begin
+    if v_count = 0 then
+        return null;
+    end if;
+    v_last := public.next_event_seq(p_user_id, v_count);
+
+    insert into public.events as e
+        (id, user_id, title, description, date, time, priority, seq, deleted)
+    select item->>'id', p_user_id, item->>'title', item->>'description',
+           (item->>'date')::date, item->>'time', item->>'priority',
+           v_last - v_count + item_number, false
+    from jsonb_array_elements(p_events) with ordinality as batch(item, item_number)
+    on conflict (id) do update set
+        title = excluded.title,
+        description = excluded.description,
+        date = excluded.date,
+        time = excluded.time,
+        priority = excluded.priority,
+        seq = excluded.seq,
+        deleted = false
+    where e.user_id = excluded.user_id;
+
+    return v_last;
+end;
+$$;
+
+-- Tombstone an event (only the user's own when p_user_id is given);
+-- returns whether a live event was found
+create or replace function public.tombstone_event(p_event_id text, p_user_id text default null)
+returns boolean
+language plpgsql
+as $$
+declare
+    v_owner text;
+begin
+    select user_id into v_owner
+    from public.events
+    where id = p_event_id and not deleted
+      and (p_user_id is null or user_id = p_user_id)
+    for update;
+    if v_owner is null then
+        return false;
+    end if;
+
+    update public.events
+    set deleted = true, seq = public.next_event_seq(v_owner, 1)
+    where id = p_event_id;
+    return true;
+end;
+$$;
+
+revoke execute on function public.add_events_with_seq(text, jsonb) from public, anon, authenticated;
+revoke execute on function public.tombstone_event(text, text) from public, anon, authenticated;
+grant execute on function public.add_events_with_seq(text, jsonb) to service_role;
+grant execute on function public.tombstone_event(text, text) to service_role;
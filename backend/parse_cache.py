@@ -0,0 +1,122 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+def make_cache_key(text: str, current_date: datetime) -> str:
+    """
+    Whitespace/case-normalized text plus the reference date. Relative dates
+    ("tomorrow", "friday") resolve differently after midnight, so the date
+    is part of the key.
+    """
+    normalized = " ".join(text.lower().split())
+    return f"{current_date.strftime('%Y-%m-%d')}|{normalized}"
+
+
+class ParseCache:
+    """
+    Size-bounded LRU cache with a TTL for parsed brain dumps. Values are lists
+    of event dicts without ids. If sqlite_path is set, entries are also written
+    to a SQLite file so several uvicorn workers share hits. Memory hits are
+    answered inline; disk reads and writes run in a worker thread so they
+    never block the event loop. Expired disk rows are purged at most once
+    every purge_interval seconds.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 sqlite_path: Optional[str] = None, purge_interval: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval = purge_interval
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0,
+                      "evictions": 0, "expirations": 0, "purged": 0}
+        self.lock = threading.Lock()
+        self.db_lock = threading.Lock()
+        self.last_purge = 0.0
+        self.db = None
+        if sqlite_path:
+            self.db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "key TEXT PRIMARY KEY, events TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self.db.commit()
+
+    async def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                events, expires_at = entry
+                if expires_at > now:
+                    self.entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return events
+                del self.entries[key]
+                self.stats["expirations"] += 1
+
+        if self.db is not None:
+            row = await asyncio.to_thread(self._disk_get, key, now)
+            if row is not None:
+                events, expires_at = row
+                with self.lock:
+                    self._store(key, events, expires_at)
+                    self.stats["disk_hits"] += 1
+                return events
+
+        with self.lock:
+            self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, events: List[Dict[str, Any]]):
+        expires_at = time.time() + self.ttl_seconds
+        with self.lock:
+            self._store(key, events, expires_at)
+        if self.db is not None:
+            await asyncio.to_thread(self._disk_set, key, events, expires_at)
+
+    def _disk_get(self, key: str, now: float) -> Optional[tuple]:
+        with self.db_lock:
+            row = self.db.execute(
+                "SELECT events, expires_at FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row and row[1] > now:
+            return json.loads(row[0]), row[1]
+        return None
+
+    def _disk_set(self, key: str, events: List[Dict[str, Any]], expires_at: float):
+        payload = json.dumps(events)
+        with self.db_lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, events, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at)
+            )
+            now = time.time()
+            purged = 0
+            if now - self.last_purge >= self.purge_interval:
+                self.last_purge = now
+                purged = self.db.execute(
+                    "DELETE FROM parse_cache WHERE expires_at <= ?", (now,)).rowcount
+            self.db.commit()
+        if purged:
+            with self.lock:
+                self.stats["purged"] += purged
+
+    def _store(self, key: str, events: List[Dict[str, Any]], expires_at: float):
+        self.entries[key] = (events, expires_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {**self.stats, "size": len(self.entries),
+                    "max_entries": self.max_entries, "shared": self.db is not None}
@@ -0,0 +1,141 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+WEEKDAY_NUMBERS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+}
+
+# Hard caps so a bad spec (a far-away until date, a huge count or interval)
+# can't explode a response or stall the event loop
+MAX_OCCURRENCES = 500
+MAX_HORIZON_DAYS = 3 * 366
+MAX_INTERVAL_DAYS = 366
+MAX_INTERVAL_WEEKS = 52
+
+
+def end_of_next_month(current: date) -> date:
+    """
+    Last day of the month after current's month
+    """
+    first_of_next = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+    first_after_next = (first_of_next + timedelta(days=32)).replace(day=1)
+    return first_after_next - timedelta(days=1)
+
+
+def default_recurrence_window(current_date: datetime) -> Tuple[date, date]:
+    """
+    Window used for repeating events: today through the end of next month.
+    The end only applies to open-ended specs (no until and no count).
+    """
+    today = current_date.date()
+    return today, end_of_next_month(today)
+
+
+def _parse_weekdays(weekdays: Any) -> Optional[set]:
+    if not weekdays:
+        return None
+    numbers = set()
+    for day in weekdays:
+        if isinstance(day, int) and 0 <= day <= 6:
+            numbers.add(day)
+        elif isinstance(day, str) and day.strip().lower() in WEEKDAY_NUMBERS:
+            numbers.add(WEEKDAY_NUMBERS[day.strip().lower()])
+    return numbers or None
+
+
+def expand_recurrence(event_data: Dict[str, Any], window_start: date, window_end: date) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily expand one event with a "recurrence" spec into concrete event dicts.
+
+    Spec fields (all optional):
+      weekdays: ["monday", "wednesday"] - repeat on these days of the week
+      interval: 1 - every N weeks when weekdays are given, otherwise every N days
+      until: "YYYY-MM-DD" - last possible date (inclusive)
+      count: 10 - stop after this many occurrences
+    The event's own "date" is the first possible occurrence. Occurrences
+    before window_start are skipped; window_end only bounds specs with
+    neither until nor count. Every spec also stops after MAX_OCCURRENCES or
+    MAX_HORIZON_DAYS past its first date. Occurrences are generated by
+    stepping whole intervals, so the cost is per occurrence, not per day.
+    """
+    spec = event_data.get("recurrence") or {}
+    base = {k: v for k, v in event_data.items() if k != "recurrence"}
+
+    try:
+        start = datetime.strptime(event_data.get("date", ""), '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        start = window_start
+
+    weekdays = _parse_weekdays(spec.get("weekdays"))
+    try:
+        interval = max(1, int(spec.get("interval") or 1))
+    except (TypeError, ValueError, OverflowError):
+        interval = 1
+    interval = min(interval, MAX_INTERVAL_DAYS if weekdays is None else MAX_INTERVAL_WEEKS)
+    try:
+        count = int(spec["count"]) if spec.get("count") else None
+    except (TypeError, ValueError, OverflowError):
+        count = None
+
+    until = None
+    if spec.get("until"):
+        try:
+            until = datetime.strptime(spec["until"], '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            pass
+    if until is not None:
+        end = until
+    elif count is not None:
+        end = date.max
+    else:
+        end = window_end
+    try:
+        end = min(end, start + timedelta(days=MAX_HORIZON_DAYS))
+    except OverflowError:
+        pass
+    limit = MAX_OCCURRENCES if count is None else min(count, MAX_OCCURRENCES)
+
+    emitted = 0
+    for day in _occurrence_dates(start, end, interval, weekdays):
+        if emitted >= limit:
+            return
+        emitted += 1
+        if day >= window_start:
+            occurrence = dict(base)
+            occurrence["date"] = day.strftime('%Y-%m-%d')
+            yield occurrence
+
+
+def _occurrence_dates(start: date, end: date, interval: int,
+                      weekdays: Optional[set]) -> Iterator[date]:
+    """
+    Dates from start through end: every interval days, or on the given
+    weekdays of every interval-th week (counted from start's week)
+    """
+    step = timedelta(days=interval) if weekdays is None else timedelta(weeks=interval)
+    offsets = [0] if weekdays is None else sorted(weekdays)
+    base = start if weekdays is None else start - timedelta(days=start.weekday())
+    while base <= end:
+        for offset in offsets:
+            day = base + timedelta(days=offset)
+            if day > end:
+                return
+            if day >= start:
+                yield day
+        try:
+            base += step
+        except OverflowError:
+            return
+
+
+def expand_events_data(events_data: Iterable[Dict[str, Any]], current_date: datetime) -> Iterator[Dict[str, Any]]:
+    """
+    Pass plain events through and expand any that carry a recurrence spec
+    """
+    window_start, window_end = default_recurrence_window(current_date)
+    for event_data in events_data:
+        if isinstance(event_data, dict) and event_data.get("recurrence"):
+            yield from expand_recurrence(event_data, window_start, window_end)
+        else:
+            yield event_data
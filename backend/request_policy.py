@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class InvalidOutput(Exception):
+    """
+    An attempt returned a response that failed validation. The original
+    validation error is kept as __cause__.
+    """
+
+
+def percentile(samples, fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class RequestPolicy:
+    """
+    Run an LLM call with a per-attempt deadline, an optional hedged second
+    request and an optional cascade to another model.
+
+    call(model) starts one completion; validate(response) turns it into the
+    parsed result or raises. Validation happens inside each attempt, so the
+    first *valid* result wins and the other attempt is cancelled.
+
+      - attempt_timeout: seconds before an attempt counts as timed out
+      - hedge_delay: if the first attempt hasn't finished after this many
+        seconds, a second identical request is fired (None/0 disables it)
+      - cascade_model: if every attempt on the primary model fails
+        validation, one more attempt is made with this model
+    """
+
+    def __init__(self, attempt_timeout: float = 20.0, hedge_delay: Optional[float] = None,
+                 cascade_model: Optional[str] = None):
+        self.attempt_timeout = attempt_timeout
+        self.hedge_delay = hedge_delay or None
+        self.cascade_model = cascade_model or None
+        self.outcomes: Dict[str, int] = {
+            "primary_ok": 0, "hedge_ok": 0, "cascade_ok": 0, "hedges_fired": 0,
+            "timeout": 0, "error": 0, "invalid": 0, "cancelled": 0,
+        }
+        self.latencies = deque(maxlen=500)
+
+    async def _attempt(self, label: str, model: str, call, validate):
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(call(model), self.attempt_timeout)
+        except asyncio.TimeoutError:
+            self.outcomes["timeout"] += 1
+            raise
+        except asyncio.CancelledError:
+            self.outcomes["cancelled"] += 1
+            raise
+        except Exception:
+            self.outcomes["error"] += 1
+            raise
+        try:
+            result = validate(response)
+        except Exception as e:
+            self.outcomes["invalid"] += 1
+            raise InvalidOutput(str(e)) from e
+        self.latencies.append(time.perf_counter() - start)
+        self.outcomes[f"{label}_ok"] += 1
+        return result
+
+    async def _hedged(self, model: str, call, validate):
+        primary = asyncio.ensure_future(
+            self._attempt("primary", model, call, validate))
+        pending = {primary}
+        if self.hedge_delay:
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay)
+            if not done:
+                self.outcomes["hedges_fired"] += 1
+                pending.add(asyncio.ensure_future(
+                    self._attempt("hedge", model, call, validate)))
+
+        last_error: Optional[BaseException] = None
+        invalid_output: Optional[InvalidOutput] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    if isinstance(last_error, InvalidOutput):
+                        invalid_output = last_error
+        finally:
+            for task in pending:
+                task.cancel()
+        # Bad output from either attempt still deserves the cascade, even if
+        # the other attempt finished last with a timeout or upstream error
+        raise invalid_output or last_error
+
+    async def run(self, model: str, call: Callable[[str], Awaitable[Any]],
+                  validate: Callable[[Any], Any]) -> Any:
+        """
+        Return the first valid result. Raises the validation error when the
+        output was bad on every model tried, or the upstream/timeout error.
+        """
+        try:
+            return await self._hedged(model, call, validate)
+        except InvalidOutput as e:
+            # Only bad output is worth a different model; errors/timeouts aren't
+            if not self.cascade_model or self.cascade_model == model:
+                raise e.__cause__
+        try:
+            return await self._attempt("cascade", self.cascade_model, call, validate)
+        except InvalidOutput as e:
+            raise e.__cause__
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.outcomes,
+            "attempt_timeout": self.attempt_timeout,
+            "hedge_delay": self.hedge_delay,
+            "cascade_model": self.cascade_model,
+            "latency_p50": percentile(self.latencies, 0.50),
+            "latency_p95": percentile(self.latencies, 0.95),
+        }
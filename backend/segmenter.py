@@ -0,0 +1,162 @@
+import re
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+from date_resolver import TEMPORAL_PATTERN, WEEKDAYS
+
+# Hard breaks between tasks: sentence ends, semicolons, new lines
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\s*[;\n]\s*")
+# Soft breaks: commas and "and"/"also"/"then" between clauses
+CLAUSE_SPLIT = re.compile(
+    r",\s*(?:and\s+|also\s+|then\s+)?|\s+(?:and also|and then|and|also|then)\s+",
+    re.IGNORECASE)
+# A clause starting like this continues a list ("monday, wednesday and friday")
+LIST_CONTINUATION = re.compile(
+    rf"(?:(?:{'|'.join(WEEKDAYS)})s?|\d+(?:st|nd|rd|th)?|every|until)\b",
+    re.IGNORECASE)
+# A period after one of these (or a single letter) doesn't end a sentence
+ABBREVIATIONS = {
+    "dr", "mr", "mrs", "ms", "mx", "prof", "st", "sr", "jr", "mt", "ave", "vs",
+    "etc", "e.g", "i.e", "a.m", "p.m", "approx", "appt", "dept", "no",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+}
+TRIM_CHARS = " \t\n.,;"
+
+PREP_PREFIX = re.compile(r"^(?:work on|prepare|prep for|prep)\s*:?\s*", re.IGNORECASE)
+
+Span = Tuple[int, int]
+
+
+def _ends_with_abbreviation(text: str, period: int) -> bool:
+    word = re.search(r"([\w.]+)$", text[:period])
+    if word is None:
+        return False
+    token = word.group(1).lower()
+    return len(token) == 1 or token in ABBREVIATIONS
+
+
+def _trim(text: str, start: int, end: int) -> Optional[Span]:
+    while start < end and text[start] in TRIM_CHARS:
+        start += 1
+    while end > start and text[end - 1] in TRIM_CHARS:
+        # Keep the period of "3 p.m." or "Dr."
+        if text[end - 1] == "." and _ends_with_abbreviation(text, end - 1):
+            break
+        end -= 1
+    return (start, end) if start < end else None
+
+
+def _pieces(text: str, pattern: re.Pattern, start: int, end: int,
+            check_abbreviations: bool = False) -> List[Span]:
+    """
+    Trimmed spans of text[start:end] between matches of pattern
+    """
+    pieces = []
+    piece_start = start
+    for match in pattern.finditer(text, start, end):
+        if check_abbreviations and text[match.start() - 1] == "." and \
+                _ends_with_abbreviation(text, match.start() - 1):
+            continue
+        piece = _trim(text, piece_start, match.start())
+        if piece:
+            pieces.append(piece)
+        piece_start = match.end()
+    piece = _trim(text, piece_start, end)
+    if piece:
+        pieces.append(piece)
+    return pieces
+
+
+def split_into_segments(text: str, max_segments: int = 12) -> List[str]:
+    """
+    Split a brain dump into independent task clauses that can be parsed
+    separately. A clause only stands alone if it has its own date phrase;
+    dateless clauses join the next dated clause in their sentence (or the
+    previous one at the end of it), and a sentence with no date at all
+    joins the previous segment (or the next one at the start of the text).
+    List continuations ("and wednesday", "until friday") stay with the
+    previous clause. Segments are slices of the original text, so merged
+    clauses keep the user's own wording between them.
+    """
+    segments: List[Span] = []
+    carried_start: Optional[int] = None
+    for sentence_start, sentence_end in _pieces(
+            text, SENTENCE_SPLIT, 0, len(text), check_abbreviations=True):
+        if not TEMPORAL_PATTERN.search(text, sentence_start, sentence_end):
+            if segments:
+                segments[-1] = (segments[-1][0], sentence_end)
+            elif carried_start is None:
+                carried_start = sentence_start
+            continue
+
+        clauses: List[Span] = []
+        pending_start: Optional[int] = None
+        for clause_start, clause_end in _pieces(
+                text, CLAUSE_SPLIT, sentence_start, sentence_end):
+            if clauses and pending_start is None and \
+                    LIST_CONTINUATION.match(text, clause_start, clause_end):
+                clauses[-1] = (clauses[-1][0], clause_end)
+                continue
+            if pending_start is None:
+                pending_start = clause_start
+            if TEMPORAL_PATTERN.search(text, clause_start, clause_end):
+                clauses.append((pending_start, clause_end))
+                pending_start = None
+        if not clauses:
+            clauses = [(sentence_start, sentence_end)]
+        elif pending_start is not None:
+            clauses[-1] = (clauses[-1][0], sentence_end)
+
+        if carried_start is not None:
+            clauses[0] = (carried_start, clauses[0][1])
+            carried_start = None
+        segments.extend(clauses)
+
+    if not segments:
+        whole = _trim(text, 0, len(text))
+        return [text[whole[0]:whole[1]]] if whole else []
+
+    # Too many tiny segments cost more than they save: regroup evenly
+    if len(segments) > max_segments:
+        group_size = -(-len(segments) // max_segments)
+        segments = [
+            (segments[i][0], segments[min(i + group_size, len(segments)) - 1][1])
+            for i in range(0, len(segments), group_size)
+        ]
+    return [text[start:end] for start, end in segments]
+
+
+def _time_sort_key(time_12: Any) -> str:
+    if not time_12:
+        return ""
+    try:
+        return datetime.strptime(time_12, "%I:%M %p").strftime("%H:%M")
+    except ValueError:
+        return str(time_12)
+
+
+def merge_segment_events(event_lists: Iterable[List[Any]]) -> List[Any]:
+    """
+    Merge per-segment ProcessedEvents: chronological order, duplicates by
+    (title, date, time) dropped, and a single prep event per deadline.
+    """
+    merged = []
+    seen = set()
+    prepped = set()
+    events = [event for events in event_lists for event in events]
+    events.sort(key=lambda e: (e.date, _time_sort_key(e.time)))
+
+    for event in events:
+        key = (event.title.strip().lower(), event.date, event.time)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        prep_subject = PREP_PREFIX.sub("", event.title.strip())
+        if prep_subject != event.title.strip():
+            subject_key = prep_subject.lower()
+            if subject_key in prepped:
+                continue
+            prepped.add(subject_key)
+        merged.append(event)
+    return merged
@@ -0,0 +1,29 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight task.
+    The first caller starts the work; callers arriving while it is pending
+    await the same result. The work runs as its own task, so a caller that
+    disconnects doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self.pending: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {"started": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self.pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self.pending[key] = task
+            task.add_done_callback(lambda _: self.pending.pop(key, None))
+            self.stats["started"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {**self.stats, "in_flight": len(self.pending)}
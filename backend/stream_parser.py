@@ -0,0 +1,65 @@
+import json
+from typing import Any, Dict, List
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally parse a JSON array of objects as text arrives from a
+    streamed completion. feed() returns every top-level object that closed
+    in the new chunk, so callers can act on events before the array ends.
+    Text before the opening '[' (like a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.buffer: List[str] = []
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        objects = []
+        for char in chunk:
+            if self.finished:
+                break
+            if not self.started:
+                if char == '[':
+                    self.started = True
+                continue
+
+            if self.depth > 0:
+                self.buffer.append(char)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in '{[':
+                if self.depth == 0:
+                    self.buffer = [char]
+                self.depth += 1
+            elif char in '}]':
+                if self.depth == 0:
+                    # Closing bracket of the outer array
+                    self.finished = True
+                    continue
+                self.depth -= 1
+                if self.depth == 0:
+                    raw = ''.join(self.buffer)
+                    self.buffer = []
+                    try:
+                        value = json.loads(raw)
+                    except json.JSONDecodeError:
+                        # Skip a malformed object, keep the rest of the stream
+                        continue
+                    if isinstance(value, dict):
+                        objects.append(value)
+        return objects
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+
+class FakeQuery:
+    """
+    Just enough of the PostgREST query builder for SupabaseEventStore, with
+    the server's max-rows cap on every select
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], max_rows: int, log: List[str]):
+        self.rows = rows
+        self.max_rows = max_rows
+        self.log = log
+        self.columns: List[str] = []
+        self.filters = []
+        self.orders = []
+        self.offset = 0
+        self.count = None
+
+    def select(self, columns: str):
+        self.columns = columns.split(",")
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) > value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) >= value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) < value)
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self.offset, self.count = start, end - start + 1
+        return self
+
+    def limit(self, count):
+        self.count = count
+        return self
+
+    def execute(self):
+        self.log.append("select")
+        rows = [row for row in self.rows if all(check(row) for check in self.filters)]
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: row[column], reverse=desc)
+        count = self.max_rows if self.count is None else min(self.count, self.max_rows)
+        rows = rows[self.offset:self.offset + count]
+        return SimpleNamespace(data=[{column: row.get(column) for column in self.columns}
+                                     for row in rows])
+
+
+class FakeSupabase:
+    def __init__(self, max_rows: int = 1000):
+        self.max_rows = max_rows
+        self.tables: Dict[str, List[Dict[str, Any]]] = {"events": [], "event_seq": []}
+        self.requests: List[str] = []
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self.tables[name], self.max_rows, self.requests)
+
+    def seed(self, user_id: str, events: List[Dict[str, Any]]):
+        """
+        Store events as the add_events_with_seq() migration function would
+        """
+        seq_rows = self.tables["event_seq"]
+        current = next((row for row in seq_rows if row["user_id"] == user_id), None)
+        if current is None:
+            current = {"user_id": user_id, "seq": 0}
+            seq_rows.append(current)
+        for event in events:
+            current["seq"] += 1
+            self.tables["events"].append(
+                {**event, "user_id": user_id, "seq": current["seq"], "deleted": False})
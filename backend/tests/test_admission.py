@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected, TokenBucket
+
+
+def default_controller(**overrides):
+    config = dict(user_rate=0.5, user_burst=5, global_rate=50, global_burst=50,
+                  max_queue=500, max_wait=5.0)
+    config.update(overrides)
+    return AdmissionController(**config)
+
+
+def test_reserve_goes_into_debt():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.01)
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.01)
+    bucket.refund()
+    assert bucket.seconds_until_token() == pytest.approx(2.0, abs=0.01)
+
+
+def test_burst_is_admitted_without_waiting():
+    async def scenario():
+        controller = default_controller()
+        for _ in range(5):
+            await asyncio.wait_for(controller.admit("alice"), 0.1)
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.stats["admitted"] == 5
+    assert controller.waiting == 0
+
+
+def test_flooding_user_cannot_fill_the_queue():
+    async def scenario():
+        controller = default_controller()
+        flood = [asyncio.ensure_future(controller.admit("abuser")) for _ in range(600)]
+        await asyncio.sleep(0)
+
+        waiting = controller.waiting
+        rejected = sum(1 for task in flood
+                       if task.done() and isinstance(task.exception(), AdmissionRejected))
+        # A well-behaved user is still admitted right away
+        await asyncio.wait_for(controller.admit("bob"), 0.1)
+
+        for task in flood:
+            task.cancel()
+        await asyncio.gather(*flood, return_exceptions=True)
+        return controller, waiting, rejected
+
+    controller, waiting, rejected = asyncio.run(scenario())
+    # Burst of 5 plus max_wait * user_rate = 2.5 tokens of debt
+    assert waiting == 2
+    assert rejected == 593
+    assert controller.stats["rejected_user"] == 593
+    assert controller.stats["rejected_queue_full"] == 0
+    assert controller.waiting == 0
+
+
+def test_queue_full_rejects_and_refunds():
+    async def scenario():
+        controller = default_controller(user_rate=100, user_burst=100, global_rate=1,
+                                         global_burst=1, max_queue=1)
+        await controller.admit("a")
+        waiter = asyncio.ensure_future(controller.admit("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.admit("c")
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return controller, rejected.value
+
+    controller, error = asyncio.run(scenario())
+    assert error.reason == "queue full"
+    assert controller.stats["rejected_queue_full"] == 1
+
+
+def test_global_limit_rejects_when_wait_exceeds_max_wait():
+    async def scenario():
+        controller = default_controller(user_rate=100, user_burst=100, global_rate=1,
+                                        global_burst=1, max_wait=0.5)
+        await controller.admit("a")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.admit("b")
+        return controller, rejected.value
+
+    controller, error = asyncio.run(scenario())
+    assert error.reason == "server busy"
+    assert error.retry_after == pytest.approx(1.0, abs=0.05)
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+pytest.importorskip("httpx")
+rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+
+from auth import TokenVerifier  # noqa: E402
+
+SECRET = "test-secret-with-enough-length-for-hs256"
+
+
+def hs256_token(secret=SECRET, **claims):
+    payload = {"sub": "user-1", "aud": "authenticated", "exp": time.time() + 3600, **claims}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def rs256_verifier(rsa_key, kid="key-1"):
+    verifier = TokenVerifier(jwks_url=None)
+    public_jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(rsa_key.public_key()))
+    verifier.keys = {kid: jwt.PyJWK({**public_jwk, "kid": kid, "alg": "RS256"})}
+    return verifier
+
+
+def test_valid_hs256_token_is_verified_then_cached():
+    verifier = TokenVerifier(jwt_secret=SECRET)
+    token = hs256_token()
+    assert verifier.verify(token)["sub"] == "user-1"
+    assert verifier.verify(token)["sub"] == "user-1"
+    assert verifier.stats["verified"] == 1
+    assert verifier.stats["cache_hits"] == 1
+
+
+@pytest.mark.parametrize("token", [
+    hs256_token(exp=time.time() - 3600),
+    hs256_token(aud="someone-else"),
+    hs256_token(secret="a-different-secret-of-enough-length"),
+    "not-a-jwt",
+])
+def test_invalid_tokens_are_rejected(token):
+    verifier = TokenVerifier(jwt_secret=SECRET)
+    with pytest.raises(jwt.PyJWTError):
+        verifier.verify(token)
+    assert verifier.stats["rejected"] == 1
+    assert not verifier.cache
+
+
+def test_hs256_is_refused_without_a_secret():
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        TokenVerifier().verify(hs256_token())
+
+
+def test_unsigned_tokens_are_refused():
+    token = jwt.encode({"sub": "user-1", "exp": time.time() + 60}, None, algorithm="none")
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        TokenVerifier(jwt_secret=SECRET).verify(token)
+
+
+def test_rs256_token_is_checked_against_the_jwks(rsa_key):
+    verifier = rs256_verifier(rsa_key)
+    token = jwt.encode({"sub": "user-2", "aud": "authenticated", "exp": time.time() + 60},
+                       rsa_key, algorithm="RS256", headers={"kid": "key-1"})
+    assert verifier.verify(token)["sub"] == "user-2"
+
+
+def test_unknown_key_id_requests_a_refresh(rsa_key):
+    async def scenario():
+        verifier = rs256_verifier(rsa_key)
+        await verifier.start()
+        token = jwt.encode({"sub": "user-2", "aud": "authenticated", "exp": time.time() + 60},
+                           rsa_key, algorithm="RS256", headers={"kid": "rotated"})
+        with pytest.raises(jwt.InvalidTokenError):
+            verifier.verify(token)
+        return verifier.refresh_requested.is_set()
+
+    assert asyncio.run(scenario())
+
+
+def test_expired_cache_entry_is_verified_again():
+    verifier = TokenVerifier(jwt_secret=SECRET)
+    token = hs256_token()
+    verifier.verify(token)
+    token_hash, (claims, _) = next(iter(verifier.cache.items()))
+    # As if the cached expiry had passed
+    verifier.cache[token_hash] = (claims, time.time() - 1)
+    verifier.verify(token)
+    assert verifier.stats["verified"] == 2
+    assert verifier.stats["cache_hits"] == 0
+
+
+def test_cache_is_bounded():
+    verifier = TokenVerifier(jwt_secret=SECRET, cache_size=2)
+    for i in range(5):
+        verifier.verify(hs256_token(sub=f"user-{i}"))
+    assert len(verifier.cache) == 2
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+
+from date_resolver import resolve_dates
+
+# A Wednesday
+REFERENCE = datetime(2025, 9, 10, 9, 0)
+
+
+def resolved(text, current_date=REFERENCE):
+    _, resolutions = resolve_dates(text, current_date)
+    return [iso for _, iso in resolutions]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("dentist friday", "2025-09-12"),
+    ("gym thursday", "2025-09-11"),
+    ("call mom monday", "2025-09-15"),
+    # Naming today's weekday means next week
+    ("team lunch wednesday", "2025-09-17"),
+    ("report this friday", "2025-09-12"),
+    ("review this wednesday", "2025-09-10"),
+])
+def test_weekday(text, expected):
+    assert resolved(text) == [expected]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("next friday", "2025-09-19"),
+    ("next monday", "2025-09-22"),
+    ("next wednesday", "2025-09-17"),
+])
+def test_next_weekday_is_in_the_following_week(text, expected):
+    assert resolved(text) == [expected]
+
+
+def test_relative_days():
+    assert resolved("today, tomorrow and the day after tomorrow") == [
+        "2025-09-10", "2025-09-11", "2025-09-12"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("end of september", "2025-09-30"),
+    ("end of the month", "2025-09-30"),
+    ("end of next month", "2025-10-31"),
+    ("end of february", "2026-02-28"),
+    ("end of this week", "2025-09-14"),
+    ("end of next week", "2025-09-21"),
+])
+def test_end_of(text, expected):
+    assert resolved(text) == [expected]
+
+
+def test_month_rollover():
+    current_date = datetime(2025, 12, 29)
+    assert resolved("friday", current_date) == ["2026-01-02"]
+    assert resolved("january 3rd", current_date) == ["2026-01-03"]
+    assert resolved("end of next month", current_date) == ["2026-01-31"]
+
+
+def test_past_month_day_moves_to_next_year():
+    assert resolved("march 5th") == ["2026-03-05"]
+    assert resolved("3rd of october") == ["2025-10-03"]
+
+
+def test_invalid_month_day_is_not_resolved():
+    assert resolved("february 30") == []
+
+
+def test_text_is_annotated():
+    text, _ = resolve_dates("essay due friday", REFERENCE)
+    assert text == "essay due friday [2025-09-12]"
@@ -0,0 +1,108 @@
+import pytest
+
+from event_store import EventStore, SQLiteEventStore, SupabaseEventStore
+from fake_supabase import FakeSupabase
+
+
+def events(count, prefix="e"):
+    return [{"id": f"{prefix}{i:05d}", "title": f"Event {i}", "description": "",
+             "date": f"2025-{9 + i % 3:02d}-{1 + i % 28:02d}",
+             "time": f"{1 + i % 12}:00 {'AM' if i % 2 else 'PM'}", "priority": "medium"}
+            for i in range(count)]
+
+
+def test_supabase_list_events_pages_past_max_rows():
+    client = FakeSupabase(max_rows=1000)
+    client.seed("alice", events(2500))
+    client.seed("bob", events(10, prefix="b"))
+    store = SupabaseEventStore(client, page_size=1000)
+
+    listed = store.list_events("alice")
+    assert len(listed) == 2500
+    assert len({event["id"] for event in listed}) == 2500
+    assert len(client.requests) == 3
+
+
+def test_supabase_list_events_month_is_paged_too():
+    client = FakeSupabase(max_rows=100)
+    client.seed("alice", events(900))
+    store = SupabaseEventStore(client, page_size=100)
+    assert len(store.list_events("alice", month="2025-09")) == 300
+
+
+def test_supabase_changes_since_pages_by_seq():
+    client = FakeSupabase(max_rows=1000)
+    client.seed("alice", events(2100))
+    store = SupabaseEventStore(client, page_size=1000)
+
+    changed, deleted = store.changes_since("alice", 0)
+    assert len(changed) == 2100 and deleted == []
+    changed, _ = store.changes_since("alice", 2000)
+    assert [event["id"] for event in changed] == [f"e{i:05d}" for i in range(2000, 2100)]
+    assert store.current_seq("alice") == 2100
+
+
+def test_incomplete_backend_fails_at_construction():
+    class NoDeletes(EventStore):
+        def add_events(self, user_id, events):
+            return 0
+
+        def list_events(self, user_id, month=None):
+            return []
+
+        def current_seq(self, user_id):
+            return 0
+
+        def changes_since(self, user_id, since, month=None):
+            return [], []
+
+    with pytest.raises(TypeError, match="delete_event"):
+        NoDeletes()
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    return SQLiteEventStore(str(tmp_path / "events.db"))
+
+
+def test_sqlite_delta_sync(sqlite_store):
+    store = sqlite_store
+    assert store.current_seq("alice") == 0
+    store.add_events("alice", events(3))
+    store.add_events("bob", events(2, prefix="b"))
+    cursor = store.current_seq("alice")
+    assert cursor == 3
+    # Per-user sequences
+    assert store.current_seq("bob") == 2
+
+    store.add_events("alice", events(5)[3:])
+    assert store.delete_event("e00001", "alice")
+    changed, deleted = store.changes_since("alice", cursor)
+    assert [event["id"] for event in changed] == ["e00003", "e00004"]
+    assert deleted == ["e00001"]
+    assert store.current_seq("alice") == 6
+
+    assert store.changes_since("alice", store.current_seq("alice")) == ([], [])
+
+
+def test_sqlite_delete_is_scoped_to_owner(sqlite_store):
+    sqlite_store.add_events("alice", events(1))
+    assert not sqlite_store.delete_event("e00000", "bob")
+    assert sqlite_store.current_seq("alice") == 1
+    assert sqlite_store.delete_event("e00000", "alice")
+    assert not sqlite_store.delete_event("e00000", "alice")
+    assert sqlite_store.list_events("alice") == []
+
+
+def test_sqlite_changes_since_filters_by_month(sqlite_store):
+    sqlite_store.add_events("alice", events(6))
+    changed, _ = sqlite_store.changes_since("alice", 0, month="2025-10")
+    assert {event["date"][:7] for event in changed} == {"2025-10"}
+
+
+def test_list_events_sorts_by_time_of_day(sqlite_store):
+    sqlite_store.add_events("alice", [
+        {"id": str(i), "title": "t", "date": "2025-09-12", "time": time}
+        for i, time in enumerate(["10:00 AM", "9:00 AM", "01:00 PM", None, "12:00 PM"])])
+    assert [event["time"] for event in sqlite_store.list_events("alice")] == [
+        None, "9:00 AM", "10:00 AM", "12:00 PM", "01:00 PM"]
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+from fast_parser import fast_parse, mentioned_times
+
+# A Wednesday
+REFERENCE = datetime(2025, 9, 10, 9, 0)
+THRESHOLD = 0.8
+
+
+def parse(text):
+    return fast_parse(text, REFERENCE)
+
+
+@pytest.mark.parametrize("text, title, date, time", [
+    ("dentist appointment friday at 3pm", "Dentist appointment", "2025-09-12", "15:00"),
+    ("go to the bank tomorrow 9:30am", "Go to the bank", "2025-09-11", "09:30"),
+    ("pick up kids at school friday at 3:15pm", "Pick up kids at school", "2025-09-12", "15:15"),
+    ("meeting at 3pm on friday", "Meeting", "2025-09-12", "15:00"),
+    ("I need to call mom tomorrow", "Call mom", "2025-09-11", None),
+    ("lunch with sam at noon tomorrow", "Lunch with sam", "2025-09-11", "12:00"),
+])
+def test_single_events(text, title, date, time):
+    events, confidence = parse(text)
+    assert confidence >= THRESHOLD
+    assert [(e["title"], e["date"], e["time"]) for e in events] == [(title, date, time)]
+
+
+def test_deadline_gets_a_prep_event_the_day_before():
+    events, confidence = parse("submit essay by friday")
+    assert confidence >= THRESHOLD
+    assert [(e["title"], e["date"]) for e in events] == [
+        ("Work on Essay", "2025-09-11"), ("Essay Due", "2025-09-12")]
+
+
+def test_prep_event_is_never_before_today():
+    events, _ = parse("essay due tomorrow")
+    assert events[0]["date"] == "2025-09-10"
+
+
+def test_bare_at_hour_guesses_afternoon_with_less_confidence():
+    events, confidence = parse("coffee with ana tomorrow at 4")
+    assert events[0]["time"] == "16:00"
+    assert confidence == pytest.approx(0.9)
+
+
+@pytest.mark.parametrize("text", [
+    "dinner friday 7",
+    "gym tomorrow morning",
+])
+def test_stray_times_escalate(text):
+    _, confidence = parse(text)
+    assert confidence < THRESHOLD
+
+
+@pytest.mark.parametrize("text", [
+    "gym every monday",
+    "call mom tomorrow and dentist friday",
+    "call mom, then dentist friday",
+    "7 projects due friday",
+    "doctor on the 28th",
+    "meet at 3pm or 5pm tomorrow",
+    "dentist friday and saturday at 3pm",
+    "this is a very long brain dump line that goes well past the fast path length limit tomorrow",
+])
+def test_needs_the_llm(text):
+    events, confidence = parse(text)
+    assert confidence == 0.0 and events == []
+
+
+def test_mentioned_times():
+    assert mentioned_times("standup at 9, lunch 12:30pm and call at noon") == [
+        "09:00", "12:30", "12:00"]
+    assert mentioned_times("nothing timed") == []
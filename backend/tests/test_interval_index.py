@@ -0,0 +1,118 @@
+import asyncio
+import random
+from datetime import date, timedelta
+
+from event_store import SupabaseEventStore
+from fake_supabase import FakeSupabase
+from interval_index import (CalendarIndexes, IntervalIndex, event_interval,
+                            find_free_slot, from_minute, parse_time_of_day,
+                            to_minute)
+
+DAY = date(2025, 9, 10)
+
+
+def at(hour, minute=0, day=DAY):
+    return to_minute(day, hour * 60 + minute)
+
+
+def test_time_round_trip():
+    assert from_minute(at(14, 30)) == ("2025-09-10", "14:30")
+    assert parse_time_of_day("2:30 PM") == 14 * 60 + 30
+    assert parse_time_of_day("09:05") == 9 * 60 + 5
+    assert parse_time_of_day(None) is None
+    assert parse_time_of_day("sometime") is None
+
+
+def test_untimed_events_have_no_interval():
+    assert event_interval({"date": "2025-09-10", "time": None}, 60) is None
+    assert event_interval({"date": "2025-09-10", "time": "10:00 AM"}, 60) == (at(10), at(11))
+
+
+def test_overlapping_is_half_open():
+    index = IntervalIndex()
+    index.add("a", at(9), at(10))
+    index.add("b", at(10), at(11))
+    index.add("c", at(12), at(13))
+    assert [entry[2] for entry in index.overlapping(at(9, 30), at(10, 30))] == ["a", "b"]
+    assert [entry[2] for entry in index.overlapping(at(10), at(10, 30))] == ["b"]
+    assert list(index.overlapping(at(11), at(12))) == []
+
+
+def test_overlapping_finds_long_intervals_that_started_earlier():
+    index = IntervalIndex()
+    index.add("all-morning", at(8), at(12))
+    index.add("short", at(9), at(9, 15))
+    assert [entry[2] for entry in index.overlapping(at(11), at(11, 30))] == ["all-morning"]
+
+
+def test_remove_and_readd():
+    index = IntervalIndex()
+    index.add("a", at(9), at(10))
+    index.add("a", at(15), at(16))
+    assert len(index) == 1
+    assert list(index.overlapping(at(9), at(10))) == []
+    index.remove("a")
+    assert len(index) == 0
+
+
+def test_overlapping_matches_brute_force():
+    rng = random.Random(7)
+    index = IntervalIndex()
+    intervals = {}
+    for i in range(500):
+        start = rng.randrange(0, 10_000)
+        end = start + rng.randrange(1, 300)
+        index.add(str(i), start, end)
+        intervals[str(i)] = (start, end)
+    for _ in range(200):
+        start = rng.randrange(0, 10_000)
+        end = start + rng.randrange(1, 120)
+        expected = {event_id for event_id, (s, e) in intervals.items() if s < end and e > start}
+        assert {entry[2] for entry in index.overlapping(start, end)} == expected
+
+
+def test_free_slot_skips_busy_blocks():
+    index = IntervalIndex()
+    index.add("a", at(9), at(10))
+    index.add("b", at(10), at(11, 30))
+    assert find_free_slot([index], 60, at(9), at(21)) == at(11, 30)
+
+
+def test_free_slot_checks_every_index():
+    calendar, batch = IntervalIndex(), IntervalIndex()
+    calendar.add("a", at(9), at(10))
+    batch.add("b", at(10), at(11))
+    assert find_free_slot([calendar, batch], 60, at(9), at(21)) == at(11)
+
+
+def test_free_slot_respects_workday():
+    index = IntervalIndex()
+    # Before the workday starts
+    assert find_free_slot([index], 60, at(6), at(21)) == at(9)
+    # Too late today: next morning
+    next_day = date(2025, 9, 11)
+    assert find_free_slot([index], 60, at(20, 30), at(12, day=next_day)) == at(9, day=next_day)
+
+
+def test_free_slot_respects_deadline():
+    index = IntervalIndex()
+    index.add("a", at(9), at(12))
+    assert find_free_slot([index], 60, at(9), at(12, 30)) is None
+    assert find_free_slot([index], 30, at(9), at(12, 30)) == at(12)
+
+
+def test_calendar_index_sees_every_row_of_a_large_calendar():
+    client = FakeSupabase(max_rows=1000)
+    calendar = [{"id": f"e{i}", "title": f"Event {i}", "description": "",
+                 "date": (date(2025, 1, 1) + timedelta(days=i // 10)).isoformat(),
+                 "time": f"{1 + i % 10}:00 PM", "priority": "medium"}
+                for i in range(2500)]
+    client.seed("alice", calendar)
+    indexes = CalendarIndexes(SupabaseEventStore(client, page_size=1000))
+
+    index = asyncio.run(indexes.get("alice"))
+    assert len(index) == 2500
+    # The last row stored is the one a single capped select would have lost
+    last_day = date(2025, 1, 1) + timedelta(days=249)
+    assert [entry[2] for entry in index.overlapping(
+        to_minute(last_day, 22 * 60), to_minute(last_day, 22 * 60 + 30))] == ["e2499"]
@@ -0,0 +1,117 @@
+import time
+from datetime import date, datetime, timedelta
+
+from recurrence import (MAX_HORIZON_DAYS, MAX_OCCURRENCES, expand_events_data,
+                        expand_recurrence)
+
+# A Wednesday
+REFERENCE = datetime(2025, 9, 10, 9, 0)
+WINDOW = (date(2025, 9, 10), date(2025, 10, 31))
+
+
+def dates(event_data, window=WINDOW):
+    return [occurrence["date"] for occurrence in expand_recurrence(event_data, *window)]
+
+
+def test_every_day_until_is_inclusive():
+    event = {"title": "Piano", "date": "2025-09-11", "recurrence": {"until": "2025-09-14"}}
+    assert dates(event) == ["2025-09-11", "2025-09-12", "2025-09-13", "2025-09-14"]
+
+
+def test_every_other_tuesday():
+    event = {"title": "Review", "date": "2025-09-16",
+             "recurrence": {"weekdays": ["tuesday"], "interval": 2}}
+    assert dates(event) == ["2025-09-16", "2025-09-30", "2025-10-14", "2025-10-28"]
+
+
+def test_daily_interval():
+    event = {"title": "Water plants", "date": "2025-09-10",
+             "recurrence": {"interval": 3, "until": "2025-09-20"}}
+    assert dates(event) == ["2025-09-10", "2025-09-13", "2025-09-16", "2025-09-19"]
+
+
+def test_several_weekdays():
+    event = {"title": "Gym", "date": "2025-09-10",
+             "recurrence": {"weekdays": ["monday", "wednesday"], "until": "2025-09-17"}}
+    assert dates(event) == ["2025-09-10", "2025-09-15", "2025-09-17"]
+
+
+def test_count():
+    event = {"title": "Standup", "date": "2025-09-15",
+             "recurrence": {"weekdays": ["monday"], "count": 3}}
+    assert dates(event) == ["2025-09-15", "2025-09-22", "2025-09-29"]
+
+
+def test_count_is_not_clipped_to_window():
+    event = {"title": "Standup", "date": "2025-09-15",
+             "recurrence": {"weekdays": ["monday"], "count": 10}}
+    assert dates(event)[-1] == "2025-11-17"
+
+
+def test_until_is_not_clipped_to_window():
+    event = {"title": "Gym", "date": "2025-09-11", "recurrence": {"until": "2025-12-31"}}
+    expanded = dates(event)
+    assert len(expanded) == 112
+    assert expanded[-1] == "2025-12-31"
+
+
+def test_open_ended_stops_at_window_end():
+    event = {"title": "Gym", "date": "2025-09-10", "recurrence": {"weekdays": ["friday"]}}
+    assert dates(event)[-1] == "2025-10-31"
+
+
+def test_occurrences_before_window_are_skipped_but_counted():
+    event = {"title": "Standup", "date": "2025-09-01",
+             "recurrence": {"weekdays": ["monday"], "count": 3}}
+    assert dates(event) == ["2025-09-15"]
+
+
+def test_max_occurrences_cap():
+    event = {"title": "Gym", "date": "2025-09-10", "recurrence": {"until": "2030-01-01"}}
+    assert len(dates(event)) == MAX_OCCURRENCES
+
+
+def test_occurrences_keep_fields_and_drop_spec():
+    event = {"title": "Gym", "date": "2025-09-10", "time": "07:00",
+             "recurrence": {"count": 2}}
+    assert list(expand_recurrence(event, *WINDOW)) == [
+        {"title": "Gym", "date": "2025-09-10", "time": "07:00"},
+        {"title": "Gym", "date": "2025-09-11", "time": "07:00"},
+    ]
+
+
+def test_expand_events_data_passes_plain_events_through():
+    events = [{"title": "Dentist", "date": "2025-09-12"},
+              {"title": "Gym", "date": "2025-09-10", "recurrence": {"count": 2}}]
+    assert [event["date"] for event in expand_events_data(events, REFERENCE)] == [
+        "2025-09-12", "2025-09-10", "2025-09-11"]
+
+
+def test_huge_interval_is_clamped_and_fast():
+    event = {"title": "Audit", "date": "2025-09-10",
+             "recurrence": {"interval": 10_000_000, "count": 2}}
+    start = time.perf_counter()
+    assert dates(event) == ["2025-09-10", "2026-09-11"]
+    assert time.perf_counter() - start < 0.1
+
+
+def test_far_until_with_sparse_weekdays_is_fast_and_bounded():
+    event = {"title": "Review", "date": "2025-09-10",
+             "recurrence": {"weekdays": ["monday"], "interval": 1000, "until": "2999-12-31"}}
+    start = time.perf_counter()
+    expanded = dates(event)
+    assert time.perf_counter() - start < 0.1
+    horizon = date(2025, 9, 10) + timedelta(days=MAX_HORIZON_DAYS)
+    assert expanded and expanded[-1] <= horizon.isoformat()
+
+
+def test_count_stops_at_horizon():
+    event = {"title": "Yearly", "date": "2025-09-10",
+             "recurrence": {"interval": 366, "count": 100}}
+    assert len(dates(event)) == MAX_HORIZON_DAYS // 366 + 1
+
+
+def test_end_of_calendar_does_not_overflow():
+    event = {"title": "Far", "date": "9999-12-20", "recurrence": {"count": 50}}
+    window = (date(9999, 12, 1), date(9999, 12, 31))
+    assert len(dates(event, window)) == 12
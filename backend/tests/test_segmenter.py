@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from segmenter import merge_segment_events, split_into_segments
+
+
+def test_independent_dated_clauses_are_split():
+    assert split_into_segments("call mom tomorrow, dentist on tuesday and pay rent next friday") == [
+        "call mom tomorrow", "dentist on tuesday", "pay rent next friday"]
+
+
+def test_sentences_and_semicolons_are_hard_breaks():
+    assert split_into_segments("gym monday. essay due friday; dentist tomorrow\nlaundry saturday") == [
+        "gym monday", "essay due friday", "dentist tomorrow", "laundry saturday"]
+
+
+def test_abbreviations_do_not_end_a_sentence():
+    assert split_into_segments("Finish the report by friday. Meet Dr. Smith on thursday") == [
+        "Finish the report by friday", "Meet Dr. Smith on thursday"]
+    assert split_into_segments("dentist tuesday at 3 p.m. then gym friday") == [
+        "dentist tuesday at 3 p.m.", "gym friday"]
+
+
+def test_dateless_sentence_joins_previous_segment():
+    assert split_into_segments("I have 4 essays due friday. each one needs an outline.") == [
+        "I have 4 essays due friday. each one needs an outline"]
+
+
+def test_leading_dateless_sentence_joins_next_segment():
+    assert split_into_segments("Groceries are low. shop tomorrow; gym friday") == [
+        "Groceries are low. shop tomorrow", "gym friday"]
+
+
+def test_merged_clauses_keep_original_wording():
+    assert split_into_segments("rock and roll concert saturday") == [
+        "rock and roll concert saturday"]
+    assert split_into_segments("Buy milk and eggs tomorrow, gym friday") == [
+        "Buy milk and eggs tomorrow", "gym friday"]
+
+
+def test_trailing_dateless_clause_joins_previous_clause():
+    assert split_into_segments("essay due friday, needs citations") == [
+        "essay due friday, needs citations"]
+
+
+def test_list_continuations_stay_together():
+    assert split_into_segments("gym every monday, wednesday and friday, call mom tomorrow") == [
+        "gym every monday, wednesday and friday", "call mom tomorrow"]
+
+
+def test_dateless_text_is_one_segment():
+    assert split_into_segments("clean the garage, and fix the bike") == [
+        "clean the garage, and fix the bike"]
+    assert split_into_segments("  ") == []
+
+
+def test_regroups_to_max_segments():
+    text = "a monday. b tuesday. c wednesday. d thursday"
+    assert split_into_segments(text, max_segments=2) == [
+        "a monday. b tuesday", "c wednesday. d thursday"]
+
+
+def event(title, date, time=None):
+    return SimpleNamespace(title=title, date=date, time=time)
+
+
+def test_merge_orders_dedupes_and_keeps_one_prep_per_deadline():
+    merged = merge_segment_events([
+        [event("Essay Due", "2025-09-12"), event("Work on Essay", "2025-09-11")],
+        [event("Work on: essay", "2025-09-10"), event("Gym", "2025-09-11", "10:00 AM"),
+         event("Gym", "2025-09-11", "9:00 AM"), event("gym", "2025-09-11", "10:00 AM")],
+    ])
+    assert [(e.title, e.date, e.time) for e in merged] == [
+        ("Work on: essay", "2025-09-10", None),
+        ("Gym", "2025-09-11", "9:00 AM"),
+        ("Gym", "2025-09-11", "10:00 AM"),
+        ("Essay Due", "2025-09-12", None),
+    ]
@@ -0,0 +1,52 @@
+import json
+
+from stream_parser import JSONArrayStreamParser
+
+EVENTS = [
+    {"title": "Dentist", "date": "2025-09-12", "time": "15:00"},
+    {"title": 'Read "Dune", ch. [3]', "date": "2025-09-13", "tags": ["a", {"b": 1}]},
+    {"title": "Escapes \\ \" }", "date": "2025-09-14"},
+]
+
+
+def feed_in_chunks(text, size):
+    parser = JSONArrayStreamParser()
+    objects = []
+    for i in range(0, len(text), size):
+        objects.extend(parser.feed(text[i:i + size]))
+    return parser, objects
+
+
+def test_objects_arrive_whatever_the_chunking():
+    text = json.dumps(EVENTS)
+    for size in (1, 2, 7, len(text)):
+        parser, objects = feed_in_chunks(text, size)
+        assert objects == EVENTS
+        assert parser.finished
+
+
+def test_object_is_returned_as_soon_as_it_closes():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"title": "A"}, {"title"') == [{"title": "A"}]
+    assert parser.feed(': "B"}') == [{"title": "B"}]
+    assert not parser.finished
+    assert parser.feed("]") == []
+    assert parser.finished
+
+
+def test_text_around_the_array_is_ignored():
+    parser, objects = feed_in_chunks('```json\n[{"title": "A"}]\n```\nand [{"title": "B"}]', 3)
+    assert objects == [{"title": "A"}]
+    assert parser.finished
+
+
+def test_malformed_object_is_skipped():
+    parser, objects = feed_in_chunks('[{"title": "A",}, {"title": "B"}, 5, "x"]', 4)
+    assert objects == [{"title": "B"}]
+    assert parser.finished
+
+
+def test_truncated_stream_is_not_finished():
+    parser, objects = feed_in_chunks('[{"title": "A"}, {"title": "B", "da', 5)
+    assert objects == [{"title": "A"}]
+    assert not parser.finished
@@ -49,7 +49,8 @@ export default function Dashboard({
       try {
         const response = await fetch(
           `http://localhost:5001/api/events?user_id=${session.user.id}&month=${currentDate.getFullYear()
-          }-${String(currentDate.getMonth() + 1).padStart(2, "0")}`
+          }-${String(currentDate.getMonth() + 1).padStart(2, "0")}`,
+          { headers: { Authorization: `Bearer ${session.access_token}` } }
         )
         if (response.ok) {
           const userEvents = await response.json()
@@ -65,7 +66,7 @@ export default function Dashboard({
       }
     }
     loadUserEvents()
-  }, [session.user.id, currentDate])
+  }, [session.user.id, session.access_token, currentDate])
 
   const handleLogout = async () => {
     await supabase.auth.signOut();
@@ -129,6 +130,7 @@ export default function Dashboard({
         headers: {
           'Content-Type': 'application/json',
           'Accept': 'application/json',
+          'Authorization': `Bearer ${session.access_token}`,
         },
         body: JSON.stringify({
           brain_dump: brainDumpText,